@@ -0,0 +1,24 @@
+from json_codec import PayloadTemplate
+
+
+def sample_ad_payload(seller_id, name="Test Product", price=1000, **statistics):
+    """Валидное тело объявления — то же, что отдает фикстура sample_ad_data.
+
+    statistics переопределяет отдельные счетчики: sample_ad_payload(1, likes=-1)
+    """
+    return {
+        "sellerID": seller_id,
+        "name": name,
+        "price": price,
+        "statistics": {
+            "likes": 10,
+            "viewCount": 100,
+            "contacts": 5,
+            **statistics
+        }
+    }
+
+
+def sample_ad_template(codec=None, **overrides):
+    """sample_ad_payload, закодированный один раз: template.render(seller_id) дает bytes тела"""
+    return PayloadTemplate(sample_ad_payload(0, **overrides), "sellerID", codec)
@@ -0,0 +1,51 @@
+import threading
+
+from api_client import ApiClient
+
+
+class AdRegistry:
+    """Учет объявлений, созданных за сессию, чтобы удалить их одним параллельным проходом"""
+
+    def __init__(self):
+        self.ad_ids = set()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ad_ids)
+
+    def add(self, ad_id):
+        if ad_id:
+            with self.lock:
+                self.ad_ids.add(ad_id)
+
+    def discard(self, ad_id):
+        with self.lock:
+            self.ad_ids.discard(ad_id)
+
+    def sweep(self, base_url=None, concurrency=None):
+        """Удаляет все учтенные объявления, возвращает id, которые удалить не удалось.
+
+        404 считается успехом: тест мог уже удалить объявление сам.
+        """
+        with self.lock:
+            ad_ids, self.ad_ids = list(self.ad_ids), set()
+        if not ad_ids:
+            return []
+
+        with ApiClient(base_url=base_url, pool_maxsize=concurrency) as client:
+            result = client.delete_ads(ad_ids, missing_ok=True)
+        return [ad_id for _, ad_id, _, _ in result.failures]
+
+
+def seed_ads(payloads, registry=None, base_url=None, concurrency=None):
+    """Параллельно создает объявления, возвращает список (ad_id, payload).
+
+    Созданные объявления сразу учитываются в registry, даже если часть запросов упала.
+    """
+    payloads = list(payloads)
+    with ApiClient(base_url=base_url, pool_maxsize=concurrency, created_ads=registry) as client:
+        result = client.create_ads(payloads)
+    if result.failures:
+        failures = [f"{status_code} {message}" for _, _, status_code, message in result.failures]
+        raise RuntimeError(f"Не удалось создать объявления для пула: {failures}")
+    return [(ad_id, payloads[index]) for index, ad_id in result.succeeded]
@@ -1,32 +1,467 @@
+import itertools
+import threading
+import time
+from array import array
+from collections import Counter, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import requests
-from settings import BASE_URL
+from requests.adapters import HTTPAdapter
+
+import settings
+from cassette import active_cassette
+from json_codec import default_codec
+from json_stream import iter_json_array
+from metrics import EndpointStats
+from resilience import CircuitBreaker, RetryPolicy
+from response_cache import ResponseCache
+
+# Шаблоны маршрутов сервиса объявлений
+CREATE_AD = "/api/1/item"
+AD_BY_ID = "/api/1/item/{id}"
+ADS_BY_SELLER = "/api/1/{sellerID}/item"
+STATISTICS_V1 = "/api/1/statistic/{id}"
+STATISTICS_V2 = "/api/2/statistic/{id}"
+DELETE_AD = "/api/2/item/{id}"
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Эндпоинты методов ApiClient/AsyncApiClient: имя метода -> (HTTP-метод, маршрут)
+CLIENT_METHODS = {
+    "create_ad": ("POST", CREATE_AD),
+    "get_ad_by_id": ("GET", AD_BY_ID),
+    "get_ads_by_seller": ("GET", ADS_BY_SELLER),
+    "iter_ads_by_seller": ("GET", ADS_BY_SELLER),
+    "get_statistics_v1": ("GET", STATISTICS_V1),
+    "get_statistics_v2": ("GET", STATISTICS_V2),
+    "delete_ad": ("DELETE", DELETE_AD),
+}
+
+
+# Запись об одном запросе для слушателей: маршрут — шаблон, а не итоговый URL
+RequestRecord = namedtuple(
+    "RequestRecord", "method route status_code request_bytes response_bytes elapsed attempt",
+    defaults=(0,),
+)
+
+# Слушатели, которых клиенты уведомляют о каждом запросе (см. timing_plugin.py)
+request_listeners = []
+
+
+def add_request_listener(listener):
+    request_listeners.append(listener)
+
+
+def remove_request_listener(listener):
+    if listener in request_listeners:
+        request_listeners.remove(listener)
+
+
+def notify_request(record):
+    for listener in request_listeners:
+        listener(record)
+
+
+def endpoint_name(method, route):
+    """Имя эндпоинта для отчетов: метод и шаблон маршрута, например "GET /api/1/item/{id}" """
+    return f"{method} {route}"
+
+
+def build_url(base_url, route, **params):
+    """Подставляет параметры в шаблон маршрута и добавляет базовый URL"""
+    return f"{base_url}{route.format(**params)}"
 
 
 class ApiClient:
-    def __init__(self):
-        self.base_url = BASE_URL
+    def __init__(self, base_url=None, pool_connections=None, pool_maxsize=None,
+                 pool_block=None, keep_alive=None, timeout=None, created_ads=None,
+                 retry_policy=None, circuit_breaker=None, cassette=None, cache=None, codec=None):
+        self.base_url = base_url or settings.BASE_URL
+        # Кодек JSON (json_codec.py): orjson/msgspec, если установлены
+        self.codec = codec or default_codec()
+        # Учет созданных объявлений (например AdRegistry) для очистки в конце сессии
+        self.created_ads = created_ads
+
+        # Повторы при 5xx/обрывах и быстрый отказ, когда сервис лежит.
+        # RetryPolicy(total=0) и circuit_breaker=False (или CIRCUIT_FAILURE_THRESHOLD=0) отключают их
+        self.retry_policy = retry_policy or RetryPolicy()
+        if circuit_breaker is None and settings.CIRCUIT_FAILURE_THRESHOLD > 0:
+            circuit_breaker = CircuitBreaker()
+        self.circuit_breaker = circuit_breaker or None
+        # Кеш GET-ответов (response_cache.py): включается явно или через API_RESPONSE_CACHE=1
+        if cache is None and settings.RESPONSE_CACHE:
+            cache = ResponseCache()
+        self.cache = cache
+        self.retry_counts = Counter()  # эндпоинт -> число повторов
+        # _request вызывается из потоков пула (create_ads, iter_ads_by_seller): += у Counter не атомарен
+        self._retry_lock = threading.Lock()
+        # Поддерживает ли сервис limit/offset в листинге продавца (None — еще не знаем)
+        self.seller_paging = None
+        self.timeout = timeout or (settings.CONNECT_TIMEOUT, settings.READ_TIMEOUT)
+
+        # Одна сессия с пулом keep-alive соединений на весь клиент
+        self.session = requests.Session()
+        self.pool_maxsize = pool_maxsize or settings.POOL_MAXSIZE
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections or settings.POOL_CONNECTIONS,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=settings.POOL_BLOCK if pool_block is None else pool_block,
+        )
+        # Кассета (cassette.py) пишет обмены через пул или отвечает вместо сети
+        self.cassette = cassette if cassette is not None else active_cassette()
+        if self.cassette is not None:
+            adapter = self.cassette.adapter(adapter)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if not (settings.KEEP_ALIVE if keep_alive is None else keep_alive):
+            self.session.headers["Connection"] = "close"
+
+        # requests перечитывает переменные окружения (прокси, CA bundle) на каждый
+        # запрос — это больше половины накладных расходов клиента. Читаем их один раз
+        environment = self.session.merge_environment_settings(self.base_url, {}, None, None, None)
+        self.session.proxies.update(environment["proxies"])
+        self.session.verify = environment["verify"]
+        self.session.trust_env = False
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _request(self, method, route, json=None, stream=False, query=None, **params):
+        url = build_url(self.base_url, route, **params)
+        # Тело кодируется один раз на все попытки; bytes (PayloadTemplate) уходят как есть
+        body = None if json is None else json if isinstance(json, bytes) else self.codec.dumps(json)
+        policy = self.retry_policy
+        retries = policy.retries_for(method)
+
+        for attempt in range(retries + 1):
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+            try:
+                response = self._send(method, route, url, body, attempt, stream, query)
+            except policy.exceptions:
+                self._record_outcome(failed=True)
+                if attempt == retries:
+                    raise
+            except BaseException:
+                # Прочие ошибки (обрыв тела, кодек) не повторяются, но тоже сбой: иначе
+                # пробный запрос half-open остался бы "в полете" и breaker отклонял бы все
+                self._record_outcome(failed=True)
+                raise
+            else:
+                self._record_outcome(failed=response.status_code >= 500)
+                if attempt == retries or response.status_code not in policy.statuses:
+                    return response
+                # Потоковый ответ не дочитан: закрываем, чтобы соединение вернулось в пул
+                response.close()
+            with self._retry_lock:
+                self.retry_counts[endpoint_name(method, route)] += 1
+            time.sleep(policy.backoff(attempt))
+
+    def _record_outcome(self, failed):
+        if self.circuit_breaker is None:
+            return
+        if failed:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def _send(self, method, route, url, body, attempt, stream=False, query=None):
+        headers = JSON_HEADERS if body is not None else None
+        if not request_listeners:
+            return self._with_codec(self.session.request(
+                method, url, data=body, headers=headers, params=query, timeout=self.timeout, stream=stream), stream)
+
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self._with_codec(self.session.request(
+                method, url, data=body, headers=headers, params=query, timeout=self.timeout, stream=stream), stream)
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            if response is None:
+                notify_request(RequestRecord(method, route, None, 0, 0, elapsed, attempt))
+            else:
+                # Потоковое тело еще не прочитано: берем размер из заголовка
+                response_bytes = (int(response.headers.get("Content-Length") or 0) if stream
+                                  else len(response.content))
+                notify_request(RequestRecord(
+                    method, route, response.status_code,
+                    len(response.request.body or b""), response_bytes, elapsed, attempt,
+                ))
+
+    def _with_codec(self, response, stream):
+        """response.json() декодирует bytes тела кодеком клиента, без промежуточной str"""
+        if not stream:
+            loads, content = self.codec.loads, response.content
+            response.json = lambda **kwargs: loads(content)
+        return response
+
+    def _cached_get(self, route, use_cache, ad_id=None, seller_id=None, **params):
+        """GET через кеш ответов, если он включен и use_cache не False"""
+        if self.cache is None or not use_cache:
+            return self._request("GET", route, **params)
+        key = (route, ad_id, seller_id)
+        response = self.cache.get(key)
+        if response is None:
+            response = self._request("GET", route, **params)
+            if response.status_code == 200:
+                if route == AD_BY_ID:
+                    seller_id = _ad_seller(response)
+                self.cache.put(key, response, ad_id, seller_id)
+        return response
 
     def create_ad(self, data):
-        return requests.post(f"{self.base_url}/api/1/item", json=data)
+        return self._create_ad(data)[0]
+
+    def _create_ad(self, data, parse=False):
+        """(ответ, id объявления); id разбирается, только если он кому-то нужен"""
+        response = self._request("POST", CREATE_AD, json=data)
+        ad_id = None
+        if response.status_code == 200 and (parse or self.created_ads is not None or self.cache is not None):
+            ad_id = extract_ad_id(response.json())
+            if self.created_ads is not None:
+                self.created_ads.add(ad_id)
+            if self.cache is not None and isinstance(data, dict):
+                self.cache.remember_seller(ad_id, data.get("sellerID"))
+                self.cache.invalidate(seller_id=data.get("sellerID"))
+            elif self.cache is not None:
+                # Готовое тело (bytes): продавец неизвестен, сбрасываются все листинги
+                self.cache.invalidate(ad_id=ad_id)
+        return response, ad_id
 
-    def get_ad_by_id(self, ad_id):
-        return requests.get(f"{self.base_url}/api/1/item/{ad_id}")
+    def create_ads(self, payloads, workers=None):
+        """Создает объявления из итерируемого payloads через пул из workers потоков.
 
-    def get_ads_by_seller(self, seller_id):
-        return requests.get(f"{self.base_url}/api/1/{seller_id}/item")
+        payloads читается по мере отправки, поэтому может быть генератором на
+        сотни тысяч элементов. Возвращает BulkResult: succeeded — (индекс, ad_id).
+        """
+        def send(data):
+            response, ad_id = self._create_ad(data, parse=True)
+            if ad_id is None:
+                return None, response.status_code, response.text
+            return ad_id, response.status_code, None
+        return self._bulk(payloads, send, workers)
 
-    def get_statistics_v1(self, ad_id):
-        return requests.get(f"{self.base_url}/api/1/statistic/{ad_id}")
+    def delete_ads(self, ad_ids, workers=None, missing_ok=False):
+        """Удаляет объявления через пул из workers потоков; missing_ok — 404 тоже успех.
+
+        Возвращает BulkResult: succeeded — (индекс, ad_id).
+        """
+        ok_statuses = (200, 404) if missing_ok else (200,)
+
+        def send(ad_id):
+            response = self.delete_ad(ad_id)
+            if response.status_code not in ok_statuses:
+                return None, response.status_code, response.text
+            return ad_id, response.status_code, None
+        return self._bulk(ad_ids, send, workers)
+
+    def _bulk(self, items, send, workers=None):
+        # Потоков не больше, чем соединений в пуле: лишние открывались бы и закрывались на каждый запрос
+        workers = workers or self.pool_maxsize
+        items = enumerate(items)
+        lock = threading.Lock()
+
+        def worker():
+            done = []
+            while True:
+                with lock:
+                    index, item = next(items, (None, None))
+                if index is None:
+                    return done
+                started = time.perf_counter()
+                try:
+                    value, status_code, message = send(item)
+                except Exception as error:
+                    value, status_code, message = None, None, f"{type(error).__name__}: {error}"
+                # Элемент хранится только для отказов, чтобы результат оставался компактным
+                done.append((index, time.perf_counter() - started, value,
+                             None if value is not None else (item, status_code, message)))
+
+        with ThreadPoolExecutor(workers) as executor:
+            futures = [executor.submit(worker) for _ in range(workers)]
+            done = sorted(itertools.chain.from_iterable(future.result() for future in futures),
+                          key=lambda record: record[0])
+        return BulkResult(done)
+
+    def get_ad_by_id(self, ad_id, use_cache=True):
+        return self._cached_get(AD_BY_ID, use_cache, ad_id=ad_id, id=ad_id)
+
+    def get_ads_by_seller(self, seller_id, use_cache=True):
+        return self._cached_get(ADS_BY_SELLER, use_cache, seller_id=seller_id, sellerID=seller_id)
+
+    def iter_ads_by_seller(self, seller_id, chunk_size=64 * 1024, page_size=None, prefetch=True):
+        """Потоково отдает объявления продавца по одному, не держа в памяти весь ответ.
+
+        С page_size (или settings.SELLER_PAGE_SIZE) листинг читается страницами
+        через limit/offset, следующая страница запрашивается в фоне, пока
+        вызывающий обрабатывает текущую. Если сервис пагинацию не поддерживает,
+        первый же ответ содержит весь список — он дочитывается потоково, а
+        клиент запоминает это и дальше делает один запрос без параметров.
+        Если limit соблюдается, а offset нет (вторая страница повторяет первую),
+        список дочитывается одним запросом без уже отданных объявлений.
+        При статусе, отличном от 200, бросает requests.HTTPError.
+        """
+        page_size = settings.SELLER_PAGE_SIZE if page_size is None else page_size
+        if not page_size or self.seller_paging is False:
+            yield from self._stream_seller(seller_id, chunk_size)
+            return
+
+        response = self._request("GET", ADS_BY_SELLER, stream=True, query={"limit": page_size, "offset": 0},
+                                 sellerID=seller_id)
+        with response:
+            if response.status_code == 400 and self.seller_paging is None:
+                # Сервис мог отвергнуть незнакомые параметры: повторяем без них
+                response.close()
+                yield from self._stream_seller(seller_id, chunk_size, detect=True)
+                return
+            _raise_for_listing(response)
+            ads = iter_json_array(response.iter_content(chunk_size))
+            page = list(itertools.islice(ads, page_size + 1))
+            if len(page) > page_size:
+                # limit проигнорирован: это весь список, дочитываем его из того же ответа
+                self.seller_paging = False
+                yield from page
+                yield from ads
+                return
+        if len(page) < page_size:
+            yield from page
+            return
+
+        offset = len(page)
+        first_id = page[0].get("id")
+        with ThreadPoolExecutor(1) as executor:
+            fetch = executor.submit if prefetch else _completed
+            pending = fetch(self._seller_page, seller_id, offset, page_size)
+            while True:
+                # Пока вызывающий обрабатывает страницу, следующая уже запрошена
+                yield from page
+                next_page = pending.result()
+                if next_page and next_page[0].get("id") == first_id:
+                    # offset проигнорирован: снова пришла первая страница. Читаем весь
+                    # список без параметров и пропускаем offset уже отданных объявлений
+                    self.seller_paging = False
+                    yield from itertools.islice(self._stream_seller(seller_id, chunk_size), offset, None)
+                    return
+                if next_page:
+                    self.seller_paging = True
+                page = next_page
+                if len(page) < page_size:
+                    yield from page
+                    return
+                offset += len(page)
+                pending = fetch(self._seller_page, seller_id, offset, page_size)
+
+    def _stream_seller(self, seller_id, chunk_size, detect=False):
+        response = self._request("GET", ADS_BY_SELLER, stream=True, sellerID=seller_id)
+        with response:
+            _raise_for_listing(response)
+            if detect:
+                self.seller_paging = False
+            yield from iter_json_array(response.iter_content(chunk_size))
+
+    def _seller_page(self, seller_id, offset, limit):
+        """Одна страница листинга; 404 за концом списка — пустая страница"""
+        response = self._request("GET", ADS_BY_SELLER, query={"limit": limit, "offset": offset}, sellerID=seller_id)
+        if response.status_code == 404:
+            return []
+        _raise_for_listing(response)
+        return response.json()
+
+    def get_statistics_v1(self, ad_id, use_cache=True):
+        return self._cached_get(STATISTICS_V1, use_cache, ad_id=ad_id, id=ad_id)
 
     def delete_ad(self, ad_id):
-        return requests.delete(f"{self.base_url}/api/2/item/{ad_id}")
+        response = self._request("DELETE", DELETE_AD, id=ad_id)
+        if self.cache is not None:
+            self.cache.invalidate(ad_id=ad_id)
+        return response
 
-    def get_statistics_v2(self, ad_id):
-        return requests.get(f"{self.base_url}/api/2/statistic/{ad_id}")
+    def get_statistics_v2(self, ad_id, use_cache=True):
+        return self._cached_get(STATISTICS_V2, use_cache, ad_id=ad_id, id=ad_id)
 
     def extract_ad_id(self, response_data):
-        if isinstance(response_data, dict) and "status" in response_data:
-            status_text = response_data["status"]
-            if " - " in status_text:
-                return status_text.split(" - ")[-1]
-        return None
\ No newline at end of file
+        return extract_ad_id(response_data)
+
+    def validate(self, response, schema):
+        """Декодирует JSON ответа и проверяет его схемой из schemas.py, возвращает данные"""
+        return schema.validate(response.json())
+
+
+class BulkResult:
+    """Итог create_ads/delete_ads: успешные id, отказы и задержка каждого элемента по порядку входа"""
+
+    def __init__(self, done=()):
+        self.succeeded = []  # (индекс, ad_id)
+        self.failures = []  # (индекс, элемент, статус или None, сообщение)
+        self.latencies = array("d")  # секунды, по индексу элемента
+        for index, elapsed, value, failure in done:
+            self.latencies.append(elapsed)
+            if failure is None:
+                self.succeeded.append((index, value))
+            else:
+                self.failures.append((index,) + failure)
+
+    def __len__(self):
+        return len(self.latencies)
+
+    @property
+    def ids(self):
+        return [ad_id for _, ad_id in self.succeeded]
+
+    @property
+    def ok(self):
+        return not self.failures
+
+    def latency_stats(self):
+        stats = EndpointStats()
+        for elapsed in self.latencies:
+            stats.add(elapsed)
+        stats.errors = len(self.failures)
+        return stats
+
+
+def _raise_for_listing(response):
+    if response.status_code != 200:
+        response.raise_for_status()
+        raise requests.HTTPError(f"Unexpected status {response.status_code}", response=response)
+
+
+def _ad_seller(response):
+    """sellerId из ответа GET /api/1/item/{id} (массив из одного объявления или объект)"""
+    try:
+        data = response.json()
+    except ValueError:
+        return None
+    if isinstance(data, list):
+        data = data[0] if data else None
+    return data.get("sellerId") if isinstance(data, dict) else None
+
+
+def _completed(function, *args):
+    """Синхронный аналог executor.submit: выполняет сразу, результат в Future"""
+    future = Future()
+    future.set_result(function(*args))
+    return future
+
+
+def extract_ad_id(response_data):
+    """Извлекает ID объявления из строки "Сохранили объявление - <uuid>".
+
+    rpartition быстрее и split, и заранее скомпилированного регулярного выражения:
+    один проход с конца строки без списка частей и объекта Match.
+    """
+    if type(response_data) is dict:
+        status_text = response_data.get("status")
+        if type(status_text) is str:
+            _, separator, ad_id = status_text.rpartition(" - ")
+            if separator:
+                return ad_id
+    return None
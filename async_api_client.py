@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+import httpx
+
+import settings
+from cassette import active_cassette
+from json_codec import default_codec
+from api_client import (
+    AD_BY_ID,
+    ADS_BY_SELLER,
+    CREATE_AD,
+    DELETE_AD,
+    JSON_HEADERS,
+    STATISTICS_V1,
+    STATISTICS_V2,
+    RequestRecord,
+    build_url,
+    extract_ad_id,
+    notify_request,
+    request_listeners,
+)
+
+
+class AsyncApiClient:
+    """Асинхронный клиент с тем же набором методов, что и ApiClient"""
+
+    def __init__(self, base_url=None, max_connections=None, max_keepalive=None,
+                 timeout=None, concurrency=None, cassette=None, codec=None):
+        self.base_url = base_url or settings.BASE_URL
+        self.codec = codec or default_codec()
+        self.concurrency = concurrency or settings.ASYNC_CONCURRENCY
+        max_connections = max_connections or settings.POOL_MAXSIZE
+        transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive or max_connections,
+        ))
+        self.cassette = cassette if cassette is not None else active_cassette()
+        if self.cassette is not None:
+            transport = self.cassette.async_transport(transport)
+        self.client = httpx.AsyncClient(
+            transport=transport,
+            timeout=timeout or httpx.Timeout(settings.READ_TIMEOUT, connect=settings.CONNECT_TIMEOUT),
+        )
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _request(self, method, route, json=None, **params):
+        url = build_url(self.base_url, route, **params)
+        body = None if json is None else json if isinstance(json, bytes) else self.codec.dumps(json)
+        headers = JSON_HEADERS if body is not None else None
+        if not request_listeners:
+            return self._with_codec(await self.client.request(method, url, content=body, headers=headers))
+
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self._with_codec(await self.client.request(method, url, content=body, headers=headers))
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            if response is None:
+                notify_request(RequestRecord(method, route, None, 0, 0, elapsed))
+            else:
+                notify_request(RequestRecord(
+                    method, route, response.status_code,
+                    len(response.request.content), len(response.content), elapsed,
+                ))
+
+    def _with_codec(self, response):
+        """response.json() декодирует bytes тела кодеком клиента"""
+        loads, content = self.codec.loads, response.content
+        response.json = lambda **kwargs: loads(content)
+        return response
+
+    async def create_ad(self, data):
+        return await self._request("POST", CREATE_AD, json=data)
+
+    async def get_ad_by_id(self, ad_id):
+        return await self._request("GET", AD_BY_ID, id=ad_id)
+
+    async def get_ads_by_seller(self, seller_id):
+        return await self._request("GET", ADS_BY_SELLER, sellerID=seller_id)
+
+    async def get_statistics_v1(self, ad_id):
+        return await self._request("GET", STATISTICS_V1, id=ad_id)
+
+    async def delete_ad(self, ad_id):
+        return await self._request("DELETE", DELETE_AD, id=ad_id)
+
+    async def get_statistics_v2(self, ad_id):
+        return await self._request("GET", STATISTICS_V2, id=ad_id)
+
+    def extract_ad_id(self, response_data):
+        return extract_ad_id(response_data)
+
+    async def map(self, func, items, concurrency=None, return_exceptions=False):
+        """Применяет корутину func ко всем items не более чем в concurrency потоков.
+
+        Результаты возвращаются в порядке items. Воркеры берут элементы из общего
+        итератора по одному, поэтому items может быть генератором: он не читается
+        в память целиком, и одновременно существует не больше concurrency корутин.
+        Без return_exceptions первая ошибка отменяет запросы остальных воркеров.
+        """
+        results = {}
+        queue = enumerate(items)
+
+        async def worker():
+            for index, item in queue:
+                try:
+                    results[index] = await func(item)
+                except Exception as error:
+                    if not return_exceptions:
+                        raise
+                    results[index] = error
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(concurrency or self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            # Первая ошибка останавливает остальных воркеров: иначе они дочитали бы items
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        return [results[index] for index in range(len(results))]
+
+    async def create_ads(self, payloads, concurrency=None, return_exceptions=False):
+        """Создает объявления параллельно, возвращает ответы в порядке payloads"""
+        return await self.map(self.create_ad, payloads, concurrency, return_exceptions)
+
+    async def get_ads(self, ad_ids, concurrency=None, return_exceptions=False):
+        return await self.map(self.get_ad_by_id, ad_ids, concurrency, return_exceptions)
+
+    async def get_statistics_many(self, ad_ids, version=1, concurrency=None, return_exceptions=False):
+        """Получает статистику (v1 или v2) для всех ad_ids"""
+        method = self.get_statistics_v1 if version == 1 else self.get_statistics_v2
+        return await self.map(method, ad_ids, concurrency, return_exceptions)
+
+    async def delete_ads(self, ad_ids, concurrency=None, return_exceptions=False):
+        return await self.map(self.delete_ad, ad_ids, concurrency, return_exceptions)
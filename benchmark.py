@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки тестового клиента: накладные расходы ApiClient, разбор ответов,
+JSON и пропускная способность разных стилей вызова на локальной заглушке.
+
+Результаты сохраняются в .benchmarks/<commit>.json и сравниваются с
+предыдущим сохраненным прогоном, чтобы регрессии в самом тестовом
+окружении были видны между коммитами.
+
+    python benchmark.py                 # прогнать и сравнить с последним сохраненным
+    python benchmark.py --quick         # меньше итераций
+    python benchmark.py --compare .benchmarks/abc123.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from ad_payloads import sample_ad_payload, sample_ad_template
+from api_client import ApiClient, extract_ad_id
+from async_api_client import AsyncApiClient
+from cassette import RECORD, REPLAY, Cassette
+from json_codec import CODECS
+from models import Ad
+
+RESULTS_DIR = Path(".benchmarks")
+SELLER_ID = 424242
+LARGE_LISTING_SIZE = 10000
+REGRESSION_THRESHOLD = 0.10
+
+
+class StubProcess:
+    """Заглушка в отдельном процессе, чтобы не делить GIL с измеряемым клиентом"""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "stub_server.py", "--port", "0"],
+            stdout=subprocess.PIPE, text=True,
+        )
+        self.url = self.process.stdout.readline().split()[-1]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        self.process.wait()
+
+
+def best_per_op(func, number, repeat=5):
+    """Лучшее время одного вызова, секунды"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def bench_client_overhead(url, number):
+    """Накладные расходы методов ApiClient без сети: ответы отдаются из кассеты"""
+    path = os.path.join(tempfile.mkdtemp(), "bench.jsonl")
+    payload = sample_ad_payload(SELLER_ID)
+    recorder = Cassette(path, RECORD)
+    with ApiClient(base_url=url, cassette=recorder) as client:
+        ad_id = extract_ad_id(client.create_ad(payload).json())
+        client.get_ad_by_id(ad_id)
+        client.get_ads_by_seller(SELLER_ID)
+        client.get_statistics_v1(ad_id)
+        client.get_statistics_v2(ad_id)
+        client.delete_ad(ad_id)
+    recorder.close()
+
+    client = ApiClient(base_url=url, cassette=Cassette(path, REPLAY))
+    calls = {
+        "create_ad": lambda: client.create_ad(payload),
+        "get_ad_by_id": lambda: client.get_ad_by_id(ad_id),
+        "get_ads_by_seller": lambda: client.get_ads_by_seller(SELLER_ID),
+        "get_statistics_v1": lambda: client.get_statistics_v1(ad_id),
+        "get_statistics_v2": lambda: client.get_statistics_v2(ad_id),
+        "delete_ad": lambda: client.delete_ad(ad_id),
+    }
+    return {f"client_overhead.{name}": best_per_op(call, number) for name, call in calls.items()}
+
+
+def bench_parsing(number):
+    status = {"status": "Сохранили объявление - 0a1b2c3d-4e5f-6789-abcd-ef0123456789"}
+    sample = sample_ad_payload(SELLER_ID)
+    ad = {
+        "createdAt": "2025-10-01 12:00:00.000000 +0000 UTC", "id": "0a1b2c3d-4e5f-6789-abcd-ef0123456789",
+        "name": "Test Product", "price": 1000, "sellerId": SELLER_ID,
+        "statistics": {"likes": 10, "viewCount": 100, "contacts": 5},
+    }
+    large = [ad] * LARGE_LISTING_SIZE
+    sample_raw = json.dumps(sample).encode()
+    large_raw = json.dumps(large).encode()
+    large_number = max(1, number // 1000)
+    results = {}
+    for name, codec_class in CODECS.items():
+        try:
+            codec = codec_class()
+        except ImportError:
+            continue
+        template = sample_ad_template(codec)
+        results.update({
+            f"codec.{name}.encode_sample": best_per_op(lambda: codec.dumps(sample), number * 10),
+            f"codec.{name}.template_sample": best_per_op(lambda: template.render(SELLER_ID), number * 10),
+            f"codec.{name}.decode_sample": best_per_op(lambda: codec.loads(sample_raw), number * 10),
+            f"codec.{name}.decode_listing_10k": best_per_op(lambda: codec.loads(large_raw), large_number),
+        })
+    return {
+        **results,
+        "parse.extract_ad_id": best_per_op(lambda: extract_ad_id(status), number * 10),
+        "json.encode_sample": best_per_op(lambda: json.dumps(sample).encode(), number * 10),
+        "json.decode_sample": best_per_op(lambda: json.loads(sample_raw), number * 10),
+        "json.encode_listing_10k": best_per_op(lambda: json.dumps(large).encode(), large_number),
+        "json.decode_listing_10k": best_per_op(lambda: json.loads(large_raw), large_number),
+        "parse.ad_models_listing_10k": best_per_op(lambda: Ad.list_from_json(large), large_number),
+    }
+
+
+def requests_per_second(func, total):
+    started = time.perf_counter()
+    func(total)
+    return total / (time.perf_counter() - started)
+
+
+def bench_throughput(url, total, workers):
+    """Запросов в секунду для GET /api/1/{sellerID}/item разными способами"""
+    seller_url = f"{url}/api/1/{SELLER_ID}/item"
+
+    def sequential(count):
+        # Без пула: новое соединение на каждый запрос, как до ApiClient с сессией
+        for _ in range(count):
+            requests.get(seller_url)
+
+    client = ApiClient(base_url=url, pool_maxsize=workers)
+
+    def pooled(count):
+        for _ in range(count):
+            client.get_ads_by_seller(SELLER_ID)
+
+    def threaded(count):
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(lambda _: client.get_ads_by_seller(SELLER_ID), range(count)))
+
+    def async_style(count):
+        async def run():
+            async with AsyncApiClient(base_url=url, concurrency=workers) as async_client:
+                await async_client.map(lambda _: async_client.get_ads_by_seller(SELLER_ID), range(count))
+        asyncio.run(run())
+
+    try:
+        return {
+            "rps.sequential": requests_per_second(sequential, total),
+            "rps.pooled": requests_per_second(pooled, total),
+            "rps.threaded": requests_per_second(threaded, total),
+            "rps.async": requests_per_second(async_style, total),
+        }
+    finally:
+        client.close()
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def latest_result(exclude=None):
+    files = sorted(RESULTS_DIR.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+    return next((path for path in files if path != exclude), None)
+
+
+def format_value(name, value):
+    if name.startswith("rps."):
+        return f"{value:>12.0f} req/s"
+    return f"{value * 1e6:>12.2f} мкс"
+
+
+def compare(results, baseline):
+    """Печатает изменения относительно baseline, возвращает список регрессий"""
+    regressions = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        # Для req/s больше — лучше, для времени — меньше
+        change = (value - base) / base if name.startswith("rps.") else (base - value) / base
+        marker = ""
+        if change < -REGRESSION_THRESHOLD:
+            marker = "  <-- регрессия"
+            regressions.append(name)
+        print(f"{name:<34} {format_value(name, value)}  {change * 100:+7.1f}%{marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарки ApiClient и тестового окружения')
+    parser.add_argument('--quick', action='store_true', help='Меньше итераций')
+    parser.add_argument('--workers', type=int, default=16, help='Потоков/корутин для threaded и async')
+    parser.add_argument('--compare', help='Файл результатов для сравнения (по умолчанию последний сохраненный)')
+    parser.add_argument('--no-save', action='store_true', help='Не сохранять результаты')
+    args = parser.parse_args()
+
+    number = 200 if args.quick else 2000
+    total = 500 if args.quick else 5000
+
+    results = {}
+    with StubProcess() as stub:
+        # Продавец с одним объявлением, чтобы листинг отвечал 200
+        with ApiClient(base_url=stub.url) as client:
+            client.create_ad(sample_ad_payload(SELLER_ID))
+        results.update(bench_client_overhead(stub.url, number))
+        results.update(bench_parsing(number))
+        results.update(bench_throughput(stub.url, total, args.workers))
+
+    saved = None
+    if not args.no_save:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        saved = RESULTS_DIR / f"{current_commit()}.json"
+        saved.write_text(json.dumps({"commit": current_commit(), "created": time.time(), "results": results}, indent=2))
+
+    baseline_path = Path(args.compare) if args.compare else latest_result(exclude=saved)
+    regressions = []
+    if baseline_path and baseline_path.exists():
+        print(f"Сравнение с {baseline_path}")
+        regressions = compare(results, json.loads(baseline_path.read_text())["results"])
+    else:
+        for name, value in results.items():
+            print(f"{name:<34} {format_value(name, value)}")
+
+    if saved:
+        print(f"Результаты сохранены в {saved}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Генерация кейсов POST /api/1/item из спецификации полей.
+
+Для каждого поля спецификация выдает значения четырех видов:
+    boundary — границы диапазона/длины и соседние с ними значения
+    sign     — ноль и отрицательные числа
+    type     — значения другого типа и отсутствующее поле
+    payload  — XSS, SQL, спецсимволы и пробелы в строках
+Валидность значения определяет само поле по контракту из TESTCASES.md,
+поэтому ожидаемый статус кейса известен заранее: 200, если все поля
+валидны, иначе 400.
+
+Наборы кейсов:
+    field_cases()     одно поле меняется, остальные валидны — каждый дефект виден отдельно
+    pairwise_cases()  все пары валидных значений разных полей за минимум запросов
+    fuzz_cases(seed)  бесконечный поток случайных тел для property-based проверки
+
+Fuzz-прогон с бюджетом запросов:
+    python case_generator.py --rps 20 --duration 300 --seed 1
+"""
+
+import argparse
+import json
+import random
+import re
+import string
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import schemas
+import settings
+from ad_registry import AdRegistry
+from api_client import ApiClient
+from resilience import RetryPolicy
+
+BOUNDARY = "boundary"
+SIGN = "sign"
+TYPE = "type"
+PAYLOAD = "payload"
+KINDS = (BOUNDARY, SIGN, TYPE, PAYLOAD)
+
+INT32_MAX = 2 ** 31 - 1
+HTML_TAG = re.compile(r"<[^>]*>")
+
+
+class _Missing:
+    """Поле отсутствует в теле запроса"""
+
+    def __repr__(self):
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+FieldValue = namedtuple("FieldValue", "field kind label value valid")
+
+
+class IntField:
+    """Целое число в [minimum, maximum]; maximum=None — без верхней границы"""
+
+    def __init__(self, minimum, maximum=None, default=None):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.default = minimum if default is None else default
+
+    def is_valid(self, value):
+        if not isinstance(value, int) or isinstance(value, bool):
+            return False
+        return value >= self.minimum and (self.maximum is None or value <= self.maximum)
+
+    def candidates(self):
+        """(вид, метка, значение) без оценки валидности"""
+        yield BOUNDARY, "min", self.minimum
+        yield BOUNDARY, "min+1", self.minimum + 1
+        if self.maximum is None:
+            yield BOUNDARY, "large", 10 ** 9
+        else:
+            yield BOUNDARY, "max", self.maximum
+            yield BOUNDARY, "max+1", self.maximum + 1
+            if self.maximum + 1 < 2 ** 31:
+                yield BOUNDARY, "int32_overflow", 2 ** 31
+            yield BOUNDARY, "int64_overflow", 2 ** 63
+        if self.minimum > 0:
+            yield SIGN, "zero", 0
+        if self.minimum - 1 not in (0, -1):
+            # Иначе совпадает с zero или negative
+            yield SIGN, "min-1", self.minimum - 1
+        yield SIGN, "negative", -1
+        yield SIGN, "large_negative", -999999
+        yield TYPE, "string", "100"
+        yield TYPE, "float", 1.5
+        yield TYPE, "bool", True
+        yield TYPE, "null", None
+        yield TYPE, "array", [1]
+        yield TYPE, "missing", MISSING
+
+    def random_value(self, rng):
+        """Случайное значение для fuzz: чаще около границ, иногда далеко за ними"""
+        low = self.minimum
+        high = self.maximum if self.maximum is not None else 10 ** 9
+        choice = rng.random()
+        if choice < 0.4:
+            return rng.randint(low, high)
+        if choice < 0.7:
+            edge = rng.choice([low, high])
+            return edge + rng.randint(-3, 3)
+        if choice < 0.9:
+            return rng.choice([-1, 1]) * rng.randint(0, 2 ** rng.randint(1, 64))
+        return rng.choice(["1", 1.5, None, True, [], {}, MISSING])
+
+
+class StringField:
+    """Непустая строка длиной до max_length без HTML-тегов"""
+
+    ALPHABET = string.ascii_letters + string.digits + " -_.,'\"\\;$%{}()/Ёёжщ✓\t"
+
+    def __init__(self, max_length, default):
+        self.max_length = max_length
+        self.default = default
+
+    def is_valid(self, value):
+        return (isinstance(value, str) and bool(value.strip()) and len(value) <= self.max_length
+                and not HTML_TAG.search(value))
+
+    def candidates(self):
+        yield BOUNDARY, "len_1", "A"
+        yield BOUNDARY, "len_max", "A" * self.max_length
+        yield BOUNDARY, "len_max+1", "A" * (self.max_length + 1)
+        yield BOUNDARY, "len_1000", "A" * 1000
+        yield BOUNDARY, "empty", ""
+        yield TYPE, "number", 123
+        yield TYPE, "null", None
+        yield TYPE, "array", ["name"]
+        yield TYPE, "missing", MISSING
+        yield PAYLOAD, "spaces", "   "
+        yield PAYLOAD, "xss_script", "<script>alert('XSS')</script>"
+        yield PAYLOAD, "xss_img", "<img src=x onerror=alert(1)>"
+        yield PAYLOAD, "html_tags", "Product with <html> tags"
+        yield PAYLOAD, "sql_injection", "'; DROP TABLE ads; --"
+        yield PAYLOAD, "sql_comment", "Product with -- SQL comment"
+        yield PAYLOAD, "quotes", "Product with 'quotes' and \"double quotes\""
+        yield PAYLOAD, "backslashes", "Product with \\backslashes\\"
+        yield PAYLOAD, "template", "Product with ${javascript}"
+        yield PAYLOAD, "control_chars", "Test\tName\nWith\tSpecial\tChars"
+        yield PAYLOAD, "unicode", "Товар №1 ✓ 日本"
+
+    def random_value(self, rng):
+        choice = rng.random()
+        if choice < 0.7:
+            length = rng.choice([rng.randint(1, 16), rng.randint(1, self.max_length + 16)])
+            return "".join(rng.choice(self.ALPHABET) for _ in range(length))
+        if choice < 0.85:
+            return rng.choice(["<b>", "<script>", "<", ">", "<>"]).join(["Product", "name"])
+        if choice < 0.95:
+            return " " * rng.randint(0, 3)
+        return rng.choice([0, None, [], MISSING])
+
+
+# Поля тела объявления; sellerID по умолчанию подставляет вызывающий (см. Case.payload)
+FIELDS = {
+    "sellerID": IntField(1, INT32_MAX),
+    "name": StringField(255, default="Test Product"),
+    "price": IntField(0, default=1000),
+    "statistics.likes": IntField(0, default=10),
+    "statistics.viewCount": IntField(0, default=100),
+    "statistics.contacts": IntField(0, default=5),
+}
+
+
+def field_values(field, kinds=KINDS):
+    spec = FIELDS[field]
+    for kind, label, value in spec.candidates():
+        if kind in kinds:
+            yield FieldValue(field, kind, label, value, spec.is_valid(value))
+
+
+class Case(namedtuple("Case", "id values expected_status")):
+    """values — {поле: значение} поверх валидного тела; expected_status — 200 или 400"""
+
+    def payload(self, seller_id):
+        body = {"sellerID": seller_id, "name": FIELDS["name"].default, "price": FIELDS["price"].default,
+                "statistics": {name.split(".", 1)[1]: spec.default
+                               for name, spec in FIELDS.items() if name.startswith("statistics.")}}
+        for field, value in self.values.items():
+            target = body
+            *parents, key = field.split(".")
+            for parent in parents:
+                target = target[parent]
+            if value is MISSING:
+                target.pop(key, None)
+            else:
+                target[key] = value
+        return body
+
+    @property
+    def invalid_fields(self):
+        return [field for field, value in self.values.items() if not FIELDS[field].is_valid(value)]
+
+
+def make_case(case_id, values):
+    valid = all(FIELDS[field].is_valid(value) for field, value in values.items())
+    return Case(case_id, values, 200 if valid else 400)
+
+
+def field_cases(field=None, kinds=KINDS, valid=None):
+    """Кейсы "одно поле — одно значение": {id: Case}, id вида "price:negative".
+
+    field ограничивает одним полем; valid=True/False оставляет только
+    валидные/невалидные значения
+    """
+    cases = {}
+    for name in ([field] if field else FIELDS):
+        for value in field_values(name, kinds):
+            if valid is None or value.valid == valid:
+                cases[f"{name}:{value.label}"] = make_case(f"{name}:{value.label}", {name: value.value})
+    return cases
+
+
+def pairwise(parameters):
+    """Строки, покрывающие каждую пару значений любых двух параметров хотя бы раз.
+
+    parameters — {имя: [значения]}. Жадный алгоритм: каждая новая строка
+    начинается с непокрытой пары и дополняется значениями, закрывающими
+    больше всего оставшихся пар. Для k параметров по n значений дает порядка
+    n^2 * log(k) строк вместо n^k полного перебора.
+    """
+    names = list(parameters)
+    if len(names) == 1:
+        # Пар нет: каждое значение единственного параметра — своя строка
+        return [{names[0]: value} for value in parameters[names[0]]]
+    uncovered = {
+        (a, i, b, j)
+        for index, a in enumerate(names) for b in names[index + 1:]
+        for i in range(len(parameters[a])) for j in range(len(parameters[b]))
+    }
+    rows = []
+    while uncovered:
+        a, i, b, j = min(uncovered)
+        row = {a: i, b: j}
+        for name in names:
+            if name in row:
+                continue
+            row[name] = max(
+                range(len(parameters[name])),
+                key=lambda candidate: sum(
+                    (other, row[other], name, candidate) in uncovered or (name, candidate, other, row[other]) in uncovered
+                    for other in row
+                ),
+            )
+        for index, a in enumerate(names):
+            for b in names[index + 1:]:
+                uncovered.discard((a, row[a], b, row[b]))
+        rows.append({name: parameters[name][row[name]] for name in names})
+    return rows
+
+
+def pairwise_cases(kinds=KINDS, valid_only=True, fields=None):
+    """Попарные комбинации значений полей: {id: Case}.
+
+    По умолчанию комбинируются только валидные значения: два невалидных поля
+    в одном теле маскируют друг друга, их проверяет field_cases().
+    fields ограничивает комбинируемые поля, остальные остаются валидными
+    """
+    parameters = {}
+    for field in fields or FIELDS:
+        values = [value for value in field_values(field, kinds) if value.valid or not valid_only]
+        if values:
+            parameters[field] = values
+    cases = {}
+    for index, row in enumerate(pairwise(parameters)):
+        labels = ",".join(f"{value.field}:{value.label}" for value in row.values())
+        cases[f"pair{index:03d}"] = make_case(f"pair{index:03d}({labels})",
+                                              {value.field: value.value for value in row.values()})
+    return cases
+
+
+def fuzz_case(seed, index):
+    """Случайный кейс номер index; тот же (seed, index) всегда дает тот же кейс"""
+    rng = random.Random(f"{seed}:{index}")
+    values = {}
+    for field, spec in FIELDS.items():
+        roll = rng.random()
+        if roll < 0.5:
+            continue
+        if roll < 0.75:
+            values[field] = rng.choice(list(spec.candidates()))[2]
+        else:
+            values[field] = spec.random_value(rng)
+    return make_case(f"fuzz:{seed}:{index}", values)
+
+
+def fuzz_cases(seed=0, start=0):
+    index = start
+    while True:
+        yield fuzz_case(seed, index)
+        index += 1
+
+
+def check_response(case, response):
+    """Свойства ответа на кейс; возвращает текст нарушения или None"""
+    if response.status_code >= 500:
+        return f"ошибка сервера {response.status_code}"
+    if response.status_code != case.expected_status:
+        return f"ожидался {case.expected_status}, получен {response.status_code}"
+    if response.status_code == 200:
+        errors = schemas.CREATE_STATUS.errors(response.json())
+        if errors:
+            return f"ответ не по схеме: {errors}"
+    return None
+
+
+class FuzzRun:
+    """Fuzz-прогон с бюджетом: не больше rps запросов в секунду в течение duration секунд"""
+
+    def __init__(self, client, rps, duration, seed=0, concurrency=16, seller_id=None):
+        self.client = client
+        self.rps = rps
+        self.duration = duration
+        self.seed = seed
+        self.concurrency = concurrency
+        self.seller_id = seller_id or random.Random(seed).randint(settings.SELLER_ID_MIN, settings.SELLER_ID_MAX)
+        self.lock = threading.Lock()
+        self.next_index = 0
+        self.sent = 0
+        self.statuses = Counter()
+        self.failures = []
+
+    def _worker(self, start, stop_at):
+        while True:
+            with self.lock:
+                index = self.next_index
+                self.next_index += 1
+            slot = start + index / self.rps
+            if slot >= stop_at:
+                return
+            delay = slot - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            case = fuzz_case(self.seed, index)
+            try:
+                response = self.client.create_ad(case.payload(self.seller_id))
+                problem = check_response(case, response)
+                status = response.status_code
+            except Exception as e:
+                problem, status = f"{type(e).__name__}: {e}", None
+            with self.lock:
+                self.sent += 1
+                self.statuses[status] += 1
+                if problem:
+                    self.failures.append((case, problem))
+
+    def run(self):
+        start = time.perf_counter()
+        stop_at = start + self.duration
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            for _ in range(self.concurrency):
+                executor.submit(self._worker, start, stop_at)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuzz-прогон POST /api/1/item по спецификации полей')
+    parser.add_argument('--base-url', help='Базовый URL сервиса (по умолчанию из settings.py)')
+    parser.add_argument('--rps', type=float, default=10, help='Бюджет: запросов в секунду')
+    parser.add_argument('--duration', type=float, default=60, help='Бюджет: длительность, секунды')
+    parser.add_argument('--seed', type=int, default=0, help='Seed: кейс воспроизводится по (seed, номер)')
+    parser.add_argument('--concurrency', '-c', type=int, default=16, help='Число параллельных потоков')
+    parser.add_argument('--failures', help='Сохранить нарушения в JSON-файл')
+    parser.add_argument('--list', choices=['field', 'pairwise'], help='Только вывести сгенерированные кейсы')
+    args = parser.parse_args()
+
+    if args.list:
+        cases = field_cases() if args.list == 'field' else pairwise_cases()
+        for case in cases.values():
+            print(f"{case.expected_status}  {case.id}")
+        print(f"Всего: {len(cases)}")
+        return
+
+    registry = AdRegistry()
+    with ApiClient(base_url=args.base_url, pool_maxsize=args.concurrency, created_ads=registry,
+                   retry_policy=RetryPolicy(total=0)) as client:
+        run = FuzzRun(client, args.rps, args.duration, seed=args.seed, concurrency=args.concurrency)
+        elapsed = run.run()
+    registry.sweep(base_url=args.base_url)
+
+    print(f"Отправлено {run.sent} кейсов за {elapsed:.1f} c ({run.sent / elapsed:.1f} в секунду), seed={args.seed}")
+    print(f"Статусы: {dict(run.statuses)}")
+    by_field = Counter(field for case, _ in run.failures for field in case.invalid_fields or ["<валидное тело>"])
+    print(f"Нарушений: {len(run.failures)}" + (f", по полям: {dict(by_field)}" if by_field else ""))
+    for case, problem in run.failures[:20]:
+        print(f"  {case.id}: {problem}; тело {json.dumps(case.payload(run.seller_id), ensure_ascii=False)[:200]}")
+
+    if args.failures:
+        with open(args.failures, "w", encoding="utf-8") as f:
+            json.dump([{"id": case.id, "problem": problem, "payload": case.payload(run.seller_id)}
+                       for case, problem in run.failures], f, ensure_ascii=False, indent=2, default=repr)
+    sys.exit(1 if run.failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Пакетный прогон независимых кейсов одного параметризованного теста.
+
+Первый тест группы отправляет запросы всех выбранных кейсов разом через пул
+потоков, остальные берут уже готовый результат. Каждый кейс по-прежнему
+отдельный тест со своим статусом и сообщением, но группа из N кейсов
+занимает примерно время самого медленного запроса, а не сумму.
+
+Кейсы, отфильтрованные через -k/-m/--deselect, не отправляются. session.items
+у каждого воркера xdist содержит все собранные тесты, поэтому группа должна
+целиком выполняться на одном воркере: conftest помечает такие тесты
+xdist_group, а pytest.ini включает --dist loadgroup. С --dist load или
+worksteal группа разойдется по воркерам, и каждый отправит ее заново.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import settings
+
+
+class CaseBatch:
+    def __init__(self, send, cases, workers=None):
+        """send(case) отправляет запрос кейса; cases — {id кейса: данные кейса}"""
+        self.send = send
+        self.cases = cases
+        self.workers = workers or settings.CASE_BATCH_WORKERS
+        self.results = None
+        self.lock = threading.Lock()
+
+    def run(self):
+        with self.lock:
+            if self.results is not None:
+                return
+            results = {}
+            with ThreadPoolExecutor(max(1, min(self.workers, len(self.cases)))) as executor:
+                futures = {case_id: executor.submit(self.send, case) for case_id, case in self.cases.items()}
+                for case_id, future in futures.items():
+                    # Исключение кейса не роняет группу: оно бросится в тесте этого кейса
+                    error = future.exception()
+                    results[case_id] = (None, error) if error else (future.result(), None)
+            self.results = results
+
+    def result(self, case_id):
+        """Ответ кейса; при первом обращении отправляется вся группа"""
+        self.run()
+        response, error = self.results[case_id]
+        if error is not None:
+            raise error
+        return response
+
+
+def selected_cases(request, cases, argname="case"):
+    """Кейсы из cases, тесты которых реально попали в прогон текущей сессии"""
+    function_id = request.node.nodeid.split("[", 1)[0]
+    selected = set()
+    for item in request.session.items:
+        callspec = getattr(item, "callspec", None)
+        if callspec and argname in callspec.params and item.nodeid.split("[", 1)[0] == function_id:
+            selected.add(callspec.params[argname])
+    return {case_id: case for case_id, case in cases.items() if case_id in selected}
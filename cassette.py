@@ -0,0 +1,211 @@
+"""
+Запись и воспроизведение HTTP-обменов ApiClient/AsyncApiClient (кассеты).
+
+Кассета — JSONL-файл, по строке на обмен. При воспроизведении все строки
+индексируются по (метод, путь, хеш тела), так что поиск ответа — O(1)
+независимо от размера кассеты. Если один и тот же запрос записан несколько
+раз (GET до и после DELETE), ответы отдаются в порядке записи, а последний
+повторяется.
+
+    pytest --cassette=cassettes/api.jsonl --cassette-mode=record
+    pytest --cassette=cassettes/api.jsonl                          # replay
+
+Воспроизведение детерминировано, пока совпадают тела запросов. Поэтому при
+активной кассете sellerID теста выводится из его nodeid (seller_ids.py), а не
+из порядка выдачи: кассету полного прогона можно воспроизводить по -k, -m или
+отдельным файлам, при любом числе воркеров xdist.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+import settings
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = (RECORD, REPLAY)
+
+
+class CassetteMissError(LookupError):
+    """В кассете нет ответа на запрос"""
+
+
+def body_hash(body):
+    if not body:
+        return ""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    try:
+        # Канонизируем JSON, чтобы порядок ключей не влиял на совпадение
+        body = json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False).encode("utf-8")
+    except ValueError:
+        pass
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def request_key(method, url, body):
+    parts = urlsplit(url)
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    return method, path, body_hash(body)
+
+
+class Cassette:
+    def __init__(self, path, mode=REPLAY):
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим кассеты: {mode}")
+        self.path = path
+        self.mode = mode
+        self.index = {}
+        self.hits = 0
+        self.lock = threading.Lock()
+        self.file = None
+        if mode == REPLAY:
+            self.load()
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Дописываем: под xdist в один файл пишут все воркеры
+            self.file = open(path, "a", encoding="utf-8")
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.index.values())
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    key = (entry["m"], entry["p"], entry["h"])
+                    self.index.setdefault(key, deque()).append(entry)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def record(self, method, url, request_body, status_code, content_type, content):
+        method, path, digest = request_key(method, url, request_body)
+        entry = {
+            "m": method, "p": path, "h": digest, "s": status_code,
+            "c": content_type or "", "b": content.decode("utf-8", errors="replace"),
+        }
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self.lock:
+            # Одна запись на строку: под O_APPEND строки воркеров не перемешиваются
+            self.file.write(line)
+            self.file.flush()
+
+    def replay(self, method, url, request_body):
+        key = request_key(method, url, request_body)
+        with self.lock:
+            entries = self.index.get(key)
+            if not entries:
+                raise CassetteMissError(f"Нет записанного ответа для {key[0]} {key[1]} (тело {key[2] or '-'})")
+            entry = entries.popleft() if len(entries) > 1 else entries[0]
+            self.hits += 1
+        return entry["s"], entry["c"], entry["b"].encode("utf-8")
+
+    def adapter(self, inner):
+        """Транспорт requests: пишет через inner или отвечает из кассеты"""
+        return RecordingAdapter(self, inner) if self.mode == RECORD else ReplayAdapter(self)
+
+    def async_transport(self, inner):
+        """Транспорт httpx для AsyncApiClient"""
+        return AsyncRecordingTransport(self, inner) if self.mode == RECORD else AsyncReplayTransport(self)
+
+
+class RecordingAdapter(BaseAdapter):
+    def __init__(self, cassette, inner):
+        super().__init__()
+        self.cassette = cassette
+        self.inner = inner
+
+    def send(self, request, stream=False, **kwargs):
+        response = self.inner.send(request, stream=False, **kwargs)
+        self.cassette.record(request.method, request.url, request.body, response.status_code,
+                             response.headers.get("Content-Type"), response.content)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, stream=False, **kwargs):
+        status_code, content_type, content = self.cassette.replay(request.method, request.url, request.body)
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = ""
+        response.headers = CaseInsensitiveDict({
+            "Content-Type": content_type,
+            "Content-Length": str(len(content)),
+        })
+        response._content = content
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette, inner):
+        self.cassette = cassette
+        self.inner = inner
+
+    async def handle_async_request(self, request):
+        response = await self.inner.handle_async_request(request)
+        content = await response.aread()
+        self.cassette.record(request.method, str(request.url), request.content, response.status_code,
+                             response.headers.get("Content-Type"), content)
+        # Тело уже распаковано, поэтому Content-Encoding не переносим
+        return httpx.Response(response.status_code, headers={"Content-Type": response.headers.get("Content-Type", "")},
+                              content=content)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette):
+        self.cassette = cassette
+
+    async def handle_async_request(self, request):
+        status_code, content_type, content = self.cassette.replay(request.method, str(request.url), request.content)
+        return httpx.Response(status_code, headers={"Content-Type": content_type}, content=content)
+
+
+_active = {}
+
+
+def active_cassette():
+    """Кассета из settings.CASSETTE_PATH/CASSETTE_MODE, одна на процесс"""
+    if not settings.CASSETTE_PATH:
+        return None
+    key = (settings.CASSETTE_PATH, settings.CASSETTE_MODE)
+    if key not in _active:
+        _active[key] = Cassette(*key)
+    return _active[key]
+
+
+def close_active_cassettes():
+    for cassette in _active.values():
+        cassette.close()
+    _active.clear()
@@ -1,32 +1,141 @@
+import itertools
+import os
+
 import pytest
-import random
+
+import settings
+from ad_payloads import sample_ad_payload
+from ad_registry import AdRegistry, seed_ads
 from api_client import ApiClient
+from case_runner import CaseBatch, selected_cases
+from cassette import MODES, RECORD, close_active_cassettes
+from seller_ids import SellerIdAllocator, keyed_index
+from stub_server import StubServer
+
+pytest_plugins = ["timing_plugin", "selection_plugin", "results_plugin", "groups_plugin"]
+
+@pytest.fixture(scope="session")
+def ad_registry():
+    """Все объявления, созданные за сессию; в конце удаляются одним параллельным проходом"""
+    registry = AdRegistry()
+    yield registry
+    leftovers = registry.sweep()
+    if leftovers:
+        print(f"WARNING: не удалось удалить объявления: {leftovers}")
+
+@pytest.fixture(scope="session")
+def api_client(ad_registry):
+    """Фикстура для API клиента: один клиент (и пул соединений) на процесс/воркер xdist.
+
+    Каждое успешно созданное через него объявление попадает в ad_registry,
+    поэтому очистка не зависит от того, дошел ли тест до delete_ad.
+    """
+    client = ApiClient(created_ads=ad_registry)
+    yield client
+    client.close()
+
+@pytest.fixture(scope="session")
+def seeded_ads(ad_registry, seller_ids):
+    """Пул объявлений, созданных параллельно один раз на сессию. Только для read-only тестов!"""
+    payloads = [sample_ad_payload(seller_ids.next(f"seeded_ads[{index}]")) for index in range(settings.SEED_POOL_SIZE)]
+    return seed_ads(payloads, registry=ad_registry)
+
+@pytest.fixture(scope="session")
+def _seeded_ads_cycle(seeded_ads):
+    return itertools.cycle(seeded_ads)
 
 @pytest.fixture
-def api_client():
-    """Фикстура для API клиента"""
-    return ApiClient()
+def seeded_ad(request, seeded_ads, _seeded_ads_cycle, seller_ids):
+    """Готовое объявление из пула: (ad_id, данные). Нельзя изменять или удалять"""
+    if seller_ids.keyed:
+        # С кассетой тест получает одно и то же объявление независимо от набора тестов
+        return seeded_ads[keyed_index(request.node.nodeid) % len(seeded_ads)]
+    return next(_seeded_ads_cycle)
+
+@pytest.fixture(scope="session")
+def seller_ids():
+    """Аллокатор sellerID: у каждого воркера xdist свой непересекающийся блок.
+
+    С кассетой sellerID выводится из nodeid теста (см. SellerIdAllocator)
+    """
+    return SellerIdAllocator.from_environment(keyed=bool(settings.CASSETTE_PATH))
 
 @pytest.fixture
-def unique_seller_id():
-    """Генерирует уникальный sellerID в диапазоне 111111-999999"""
-    return random.randint(111111, 999999)
+def unique_seller_id(request, seller_ids):
+    """Выдает sellerID, не используемый другими тестами и воркерами в этом прогоне"""
+    return seller_ids.next(request.node.nodeid)
 
 @pytest.fixture
 def sample_ad_data(unique_seller_id):
     """Фикстура с тестовыми данными для объявления"""
-    return {
-        "sellerID": unique_seller_id,
-        "name": "Test Product",
-        "price": 1000,
-        "statistics": {
-            "likes": 10,
-            "viewCount": 100,
-            "contacts": 5
-        }
-    }
+    return sample_ad_payload(unique_seller_id)
+
+@pytest.fixture(scope="session")
+def _case_batches():
+    return {}
+
+@pytest.fixture
+def create_ad_batch(request, api_client, seller_ids, _case_batches):
+    """Параллельное создание объявлений для всех кейсов параметризованного теста.
+
+    create_ad_batch(cases, build).result(case): cases — {id кейса: данные},
+    build(данные, seller_id) возвращает тело запроса. Тест параметризуется
+    по ключам cases (аргумент case); все кейсы получают одного продавца.
+    """
+    def get(cases, build):
+        function_id = request.node.nodeid.split("[", 1)[0]
+        batch = _case_batches.get(function_id)
+        if batch is None:
+            seller_id = seller_ids.next(function_id)
+            batch = CaseBatch(lambda case: api_client.create_ad(build(case, seller_id)),
+                              selected_cases(request, cases))
+            _case_batches[function_id] = batch
+        return batch
+    return get
+
+def pytest_addoption(parser):
+    parser.addoption("--stub", action="store_true", default=settings.USE_STUB,
+                     help="Запускать тесты на локальной заглушке сервиса (stub_server.py)")
+    parser.addoption("--cassette", default=settings.CASSETTE_PATH or None, metavar="PATH",
+                     help="Кассета HTTP-обменов: запись или воспроизведение без сети (cassette.py)")
+    parser.addoption("--cassette-mode", choices=MODES, default=settings.CASSETTE_MODE,
+                     help="record — записать обмены в кассету, replay — отвечать из нее")
 
 def pytest_configure(config):
     """Конфигурация pytest"""
     config.addinivalue_line("markers", "smoke: маркер для smoke-тестов")
-    config.addinivalue_line("markers", "negative: маркер для негативных тестов")
\ No newline at end of file
+    config.addinivalue_line("markers", "negative: маркер для негативных тестов")
+
+    # Воркеры xdist запускаются позже и наследуют окружение: seed продавцов общий на прогон
+    os.environ.setdefault("API_SELLER_ID_SEED", str(settings.SELLER_ID_SEED))
+
+    if config.getoption("stub"):
+        # Каждый процесс (в т.ч. воркер xdist) поднимает свою заглушку
+        config._stub_server = StubServer().start()
+        settings.BASE_URL = config._stub_server.url
+
+    if config.getoption("cassette"):
+        settings.CASSETTE_PATH = config.getoption("cassette")
+        settings.CASSETTE_MODE = config.getoption("cassette_mode")
+        # Перезаписываем кассету один раз: в контроллере xdist или в единственном процессе
+        if settings.CASSETTE_MODE == RECORD and not hasattr(config, "workerinput"):
+            if os.path.exists(settings.CASSETTE_PATH):
+                os.remove(settings.CASSETTE_PATH)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Кейсы одной пакетной группы create_ad_batch держим на одном воркере xdist"""
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    for item in items:
+        if "create_ad_batch" in getattr(item, "fixturenames", ()):
+            item.add_marker(pytest.mark.xdist_group(item.originalname))
+
+def pytest_report_header(config):
+    return f"sellerID seed: {settings.SELLER_ID_SEED} (повторить прогон: API_SELLER_ID_SEED={settings.SELLER_ID_SEED})"
+
+def pytest_unconfigure(config):
+    close_active_cassettes()
+    stub_server = getattr(config, "_stub_server", None)
+    if stub_server:
+        stub_server.stop()
\ No newline at end of file
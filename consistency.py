@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Массовая сверка статистики /api/1/statistic и /api/2/statistic.
+
+Объявления сверяются параллельно в concurrency потоков через общий пул
+соединений ApiClient, ответы v1 и v2 сравниваются по полям: статус,
+форма ответа, likes/viewCount/contacts и любые другие поля. Отчет хранит
+счетчики по полям и первые примеры расхождений, а не все ответы, поэтому
+память не растет с числом объявлений.
+
+    python consistency.py --seller 123456 --seller 234567
+    python consistency.py --ids-file ad_ids.txt --concurrency 64 --json report.json
+    python consistency.py --seed 2000                # создать 2000 объявлений, сверить и удалить
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import schemas
+import settings
+from ad_payloads import sample_ad_payload
+from ad_registry import AdRegistry, seed_ads
+from api_client import ApiClient
+
+MAX_EXAMPLES = 20
+
+
+def _statistics_items(data):
+    """Ответ статистики как список объектов: массив остается массивом, объект — [объект]"""
+    if isinstance(data, list):
+        return data
+    return [data]
+
+
+def diff_statistics(status_v1, data_v1, status_v2, data_v2):
+    """Расхождения v1 и v2 для одного объявления: [(поле, значение v1, значение v2)]"""
+    if status_v1 != status_v2:
+        return [("status", status_v1, status_v2)]
+    if status_v1 != 200:
+        return []
+    items_v1, items_v2 = _statistics_items(data_v1), _statistics_items(data_v2)
+    differences = []
+    if type(data_v1) is not type(data_v2) or len(items_v1) != len(items_v2):
+        differences.append(("shape", f"{type(data_v1).__name__}[{len(items_v1)}]",
+                            f"{type(data_v2).__name__}[{len(items_v2)}]"))
+    for item_v1, item_v2 in zip(items_v1, items_v2):
+        if not isinstance(item_v1, dict) or not isinstance(item_v2, dict):
+            if item_v1 != item_v2:
+                differences.append(("item", item_v1, item_v2))
+            continue
+        for field in sorted(set(item_v1) | set(item_v2)):
+            if item_v1.get(field) != item_v2.get(field):
+                differences.append((field, item_v1.get(field), item_v2.get(field)))
+    for version, data in (("v1", data_v1), ("v2", data_v2)):
+        if not schemas.STATISTICS_LIST.is_valid(data):
+            differences.append((f"schema_{version}", None, None))
+    return differences
+
+
+class ConsistencyReport:
+    def __init__(self, max_examples=MAX_EXAMPLES):
+        self.checked = 0
+        self.mismatched = 0
+        self.errors = 0
+        self.field_mismatches = Counter()
+        self.statuses = Counter()
+        self.examples = []
+        self.max_examples = max_examples
+
+    def add(self, ad_id, status_v1, status_v2, differences):
+        self.checked += 1
+        self.statuses[(status_v1, status_v2)] += 1
+        if not differences:
+            return
+        self.mismatched += 1
+        for field in {field for field, _, _ in differences}:
+            self.field_mismatches[field] += 1
+        if len(self.examples) < self.max_examples:
+            self.examples.append((ad_id, differences))
+
+    def add_error(self, ad_id, error):
+        self.errors += 1
+        if len(self.examples) < self.max_examples:
+            self.examples.append((ad_id, [("error", type(error).__name__, str(error))]))
+
+    def mismatch_rate(self, field=None):
+        if not self.checked:
+            return 0.0
+        count = self.mismatched if field is None else self.field_mismatches[field]
+        return count / self.checked
+
+    def to_dict(self):
+        return {
+            "checked": self.checked,
+            "mismatched": self.mismatched,
+            "errors": self.errors,
+            "mismatch_rate": self.mismatch_rate(),
+            "fields": {field: {"mismatches": count, "rate": self.mismatch_rate(field)}
+                       for field, count in self.field_mismatches.most_common()},
+            "statuses": {f"{v1}/{v2}": count for (v1, v2), count in sorted(self.statuses.items(), key=str)},
+            "examples": [{"ad_id": ad_id, "differences": [list(difference) for difference in differences]}
+                         for ad_id, differences in self.examples],
+        }
+
+    def format(self):
+        lines = [
+            f"Проверено объявлений: {self.checked}, с расхождениями: {self.mismatched} "
+            f"({self.mismatch_rate() * 100:.2f}%), ошибок запросов: {self.errors}",
+            "Статусы v1/v2: " + ", ".join(f"{v1}/{v2}: {count}" for (v1, v2), count in self.statuses.most_common()),
+        ]
+        for field, count in self.field_mismatches.most_common():
+            lines.append(f"  {field:<12} {count:>8}  {self.mismatch_rate(field) * 100:6.2f}%")
+        for ad_id, differences in self.examples:
+            details = "; ".join(f"{field}: v1={v1!r} v2={v2!r}" for field, v1, v2 in differences)
+            lines.append(f"  {ad_id}: {details}")
+        return "\n".join(lines)
+
+
+def _json_or_none(response):
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def check_consistency(ad_ids, base_url=None, concurrency=None, client=None):
+    """Сверяет v1 и v2 для всех ad_ids, возвращает ConsistencyReport.
+
+    concurrency потоков читают ad_ids из общего итератора, поэтому ad_ids может
+    быть генератором: в памяти только текущие объявления и счетчики отчета.
+    """
+    concurrency = concurrency or settings.ASYNC_CONCURRENCY
+    report = ConsistencyReport()
+    lock = threading.Lock()
+    ad_ids = iter(ad_ids)
+    own_client = client is None
+    client = client or ApiClient(base_url=base_url, pool_maxsize=concurrency)
+
+    def next_id():
+        with lock:
+            return next(ad_ids, None)
+
+    def worker():
+        while True:
+            ad_id = next_id()
+            if ad_id is None:
+                return
+            try:
+                response_v1 = client.get_statistics_v1(ad_id)
+                response_v2 = client.get_statistics_v2(ad_id)
+            except Exception as error:
+                with lock:
+                    report.add_error(ad_id, error)
+                continue
+            differences = diff_statistics(response_v1.status_code, _json_or_none(response_v1),
+                                          response_v2.status_code, _json_or_none(response_v2))
+            with lock:
+                report.add(ad_id, response_v1.status_code, response_v2.status_code, differences)
+
+    try:
+        with ThreadPoolExecutor(concurrency) as executor:
+            for future in [executor.submit(worker) for _ in range(concurrency)]:
+                future.result()
+    finally:
+        if own_client:
+            client.close()
+    return report
+
+
+def ids_from_sellers(seller_ids, base_url=None):
+    """id объявлений продавцов; листинг читается потоком, без загрузки целиком"""
+    ad_ids = []
+    with ApiClient(base_url=base_url) as client:
+        for seller_id in seller_ids:
+            ad_ids.extend(ad["id"] for ad in client.iter_ads_by_seller(seller_id))
+    return ad_ids
+
+
+def ids_from_file(path):
+    """Файл по id на строку или JSON: список id, список объектов с "id" или (id, payload) из seed_ads"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return [line.strip() for line in text.splitlines() if line.strip()]
+    ad_ids = []
+    for item in data:
+        if isinstance(item, dict):
+            ad_ids.append(item["id"])
+        elif isinstance(item, (list, tuple)):
+            ad_ids.append(item[0])
+        else:
+            ad_ids.append(item)
+    return ad_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Массовая сверка статистики v1 и v2')
+    parser.add_argument('--base-url', help='Базовый URL сервиса (по умолчанию из settings.py)')
+    parser.add_argument('--seller', type=int, action='append', default=[], help='Взять объявления продавца (можно несколько раз)')
+    parser.add_argument('--ids-file', help='Файл с id объявлений (по строке или JSON)')
+    parser.add_argument('--seed', type=int, default=0, help='Создать столько объявлений, сверить и удалить')
+    parser.add_argument('--concurrency', '-c', type=int, default=settings.ASYNC_CONCURRENCY,
+                        help='Сколько объявлений сверяется одновременно')
+    parser.add_argument('--max-mismatch-rate', type=float, default=0.0,
+                        help='Допустимая доля расхождений; выше — код выхода 1')
+    parser.add_argument('--json', help='Сохранить отчет в JSON-файл')
+    args = parser.parse_args()
+
+    ad_ids = []
+    if args.ids_file:
+        ad_ids.extend(ids_from_file(args.ids_file))
+    if args.seller:
+        ad_ids.extend(ids_from_sellers(args.seller, args.base_url))
+
+    registry = AdRegistry()
+    if args.seed:
+        rng = random.Random()
+        payloads = [sample_ad_payload(rng.randint(settings.SELLER_ID_MIN, settings.SELLER_ID_MAX),
+                                      price=rng.randint(0, 100000), likes=rng.randint(0, 1000),
+                                      viewCount=rng.randint(0, 100000), contacts=rng.randint(0, 100))
+                    for _ in range(args.seed)]
+        ad_ids.extend(ad_id for ad_id, _ in seed_ads(payloads, registry, args.base_url, args.concurrency))
+
+    if not ad_ids:
+        parser.error("нужен хотя бы один источник id: --seller, --ids-file или --seed")
+
+    # Один id из нескольких источников сверяется один раз
+    ad_ids = list(dict.fromkeys(ad_ids))
+    try:
+        report = check_consistency(ad_ids, args.base_url, args.concurrency)
+    finally:
+        registry.sweep(base_url=args.base_url)
+
+    print(report.format())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+    failed = report.errors or report.mismatch_rate() > args.max_mismatch_rate
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Pytest-плагин: именованные группы тестов (как пункты меню run_tests.sh).
+
+    pytest --groups smoke,v1-negative,v2-integration
+    python run_groups.py smoke v1-negative v2-integration -n auto
+
+Несколько групп выбираются в одной сессии: сбор тестов и session-фикстуры
+(клиент, seeded_ads) оплачиваются один раз, код выхода общий. В конце
+печатается итог по каждой группе.
+"""
+
+import pytest
+
+V1 = "test_api_v1.py"
+V2 = "test_api_v2.py"
+
+# Группа -> префиксы nodeid или другие группы
+GROUPS = {
+    "v1-positive": [f"{V1}::TestApiV1Positive"],
+    "v1-negative": [f"{V1}::TestApiV1Negative"],
+    "v1-generated": [f"{V1}::TestApiV1Generated"],
+    "v1-integration": [f"{V1}::TestApiV1Integration"],
+    "v1-security": [f"{V1}::TestApiV1Security"],
+    "v1-smoke": [f"{V1}::TestApiV1Smoke"],
+    "v2-positive": [f"{V2}::TestApiV2Positive"],
+    "v2-negative": [f"{V2}::TestApiV2Negative"],
+    "v2-integration": [f"{V2}::TestApiV2Integration"],
+    "v2-smoke": [f"{V2}::TestApiV2Smoke"],
+    "v1": [V1],
+    "v2": [V2],
+    "all": ["v1", "v2"],
+    "positive": ["v1-positive", "v2-positive"],
+    "smoke": ["v1-smoke", "v2-smoke"],
+    "negative": ["v1-negative", "v2-negative"],
+    "integration": ["v1-integration", "v2-integration"],
+}
+
+
+def expand_group(name):
+    """Префиксы nodeid группы с раскрытием вложенных групп"""
+    if name not in GROUPS:
+        raise pytest.UsageError(f"Неизвестная группа: {name}. Доступны: {', '.join(GROUPS)}")
+    prefixes = []
+    for entry in GROUPS[name]:
+        prefixes.extend(expand_group(entry) if entry in GROUPS else [entry])
+    return prefixes
+
+
+def in_group(nodeid, prefixes):
+    return any(nodeid == prefix or nodeid.startswith(prefix + "::") for prefix in prefixes)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("groups", "именованные группы тестов")
+    group.addoption("--groups", metavar="LIST",
+                    help=f"Запустить группы тестов через запятую в одной сессии: {', '.join(GROUPS)}")
+
+
+def pytest_configure(config):
+    if config.getoption("groups"):
+        names = [name.strip() for name in config.getoption("groups").split(",") if name.strip()]
+        config.pluginmanager.register(GroupSelector(config, names), "group_selector")
+
+
+class GroupSelector:
+    def __init__(self, config, names):
+        self.config = config
+        self.groups = {name: expand_group(name) for name in names}
+        # группа -> {исход: число}
+        self.outcomes = {name: {} for name in names}
+
+    def pytest_collection_modifyitems(self, config, items):
+        selected, deselected = [], []
+        for item in items:
+            matched = any(in_group(item.nodeid, prefixes) for prefixes in self.groups.values())
+            (selected if matched else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call" or report.outcome != "passed":
+            outcome = "error" if report.failed and report.when != "call" else report.outcome
+            for name, prefixes in self.groups.items():
+                if in_group(report.nodeid, prefixes):
+                    self.outcomes[name][outcome] = self.outcomes[name].get(outcome, 0) + 1
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if hasattr(self.config, "workeroutput"):
+            return
+        terminalreporter.write_sep("-", "итог по группам")
+        for name, outcomes in self.outcomes.items():
+            counts = ", ".join(f"{outcome}: {count}" for outcome, count in sorted(outcomes.items())) or "нет тестов"
+            failed = outcomes.get("failed", 0) + outcomes.get("error", 0)
+            terminalreporter.write_line(f"{name:<16} {counts}", red=bool(failed), green=not failed and bool(outcomes))
@@ -0,0 +1,112 @@
+"""
+Кодек JSON для ApiClient и AsyncApiClient.
+
+orjson или msgspec, если установлены, иначе стандартный json
+(API_JSON_CODEC=auto|orjson|msgspec|json). Кодек сразу пишет bytes тела
+запроса и читает bytes ответа без промежуточной str. Ошибки разбора —
+ValueError, как у json.loads и response.json().
+
+PayloadTemplate кодирует повторяющееся тело один раз и дальше подставляет
+только меняющееся поле:
+
+    template = PayloadTemplate(sample_ad_payload(0), "sellerID")
+    client.create_ad(template.render(seller_id))     # bytes уходят как есть
+"""
+
+import json
+
+import settings
+
+
+class StdlibCodec:
+    name = "json"
+
+    def dumps(self, value):
+        # allow_nan=False — как у requests для json=
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._dumps = orjson.dumps
+        self.loads = orjson.loads
+        self._fallback = StdlibCodec()
+
+    def dumps(self, value):
+        try:
+            return self._dumps(value)
+        except TypeError:
+            # Целые шире 64 бит (fuzz- и граничные кейсы) orjson не кодирует
+            return self._fallback.dumps(value)
+
+
+class MsgspecCodec:
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+        self._encode = msgspec.json.Encoder().encode
+        self._decode = msgspec.json.Decoder().decode
+        self._errors = (msgspec.DecodeError,)
+        self._fallback = StdlibCodec()
+
+    def dumps(self, value):
+        try:
+            return self._encode(value)
+        except (TypeError, OverflowError):
+            return self._fallback.dumps(value)
+
+    def loads(self, data):
+        try:
+            return self._decode(data)
+        except self._errors as error:
+            raise ValueError(str(error)) from error
+
+
+CODECS = {"json": StdlibCodec, "orjson": OrjsonCodec, "msgspec": MsgspecCodec}
+_default = None
+
+
+def get_codec(name=None):
+    """Кодек по имени; "auto" — самый быстрый из установленных"""
+    name = name or settings.JSON_CODEC
+    if name != "auto":
+        if name not in CODECS:
+            raise ValueError(f"Неизвестный JSON-кодек: {name}. Доступны: auto, {', '.join(CODECS)}")
+        return CODECS[name]()
+    for candidate in ("orjson", "msgspec"):
+        try:
+            return CODECS[candidate]()
+        except ImportError:
+            continue
+    return StdlibCodec()
+
+
+def default_codec():
+    """Общий на процесс кодек из settings.JSON_CODEC"""
+    global _default
+    if _default is None:
+        _default = get_codec()
+    return _default
+
+
+class PayloadTemplate:
+    """Тело запроса, закодированное один раз; render подставляет значение одного поля верхнего уровня"""
+
+    MARKER = "__payload_template_value__"
+
+    def __init__(self, data, field, codec=None):
+        self.codec = codec or default_codec()
+        encoded = self.codec.dumps(dict(data, **{field: self.MARKER}))
+        self.prefix, found, self.suffix = encoded.partition(self.codec.dumps(self.MARKER))
+        if not found:
+            raise ValueError(f"Не удалось выделить поле {field} в закодированном теле")
+
+    def render(self, value):
+        return self.prefix + self.codec.dumps(value) + self.suffix
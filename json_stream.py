@@ -0,0 +1,82 @@
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+# После скольких разобранных символов буфер обрезается (иначе срезы стоят O(n^2))
+COMPACT_THRESHOLD = 1 << 16
+
+
+class JsonStreamError(ValueError):
+    pass
+
+
+def iter_json_array(chunks, encoding="utf-8"):
+    """Лениво разбирает JSON-массив верхнего уровня из потока кусков bytes.
+
+    Элементы отдаются по одному; в памяти держится только недоразобранный
+    хвост буфера и текущий элемент, а не весь ответ и не весь список.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ""
+    position = 0
+    started = False
+    expect_item = True
+    finished = False
+    eof = False
+    count = 0
+    chunks = iter(chunks)
+
+    while not finished:
+        # Пропускаем пробелы и разделители, пока в буфере есть данные
+        while position < len(buffer) and not finished:
+            char = buffer[position]
+            if char in _WHITESPACE:
+                position += 1
+            elif not started:
+                if char != "[":
+                    raise JsonStreamError(f"Ожидался JSON-массив, получено {char!r}")
+                started = True
+                position += 1
+            elif char == "]":
+                if expect_item and count:
+                    raise JsonStreamError("Лишняя запятая перед концом массива")
+                finished = True
+                position += 1
+            elif char == ",":
+                if expect_item:
+                    raise JsonStreamError("Лишняя запятая в массиве")
+                expect_item = True
+                position += 1
+            else:
+                if not expect_item:
+                    raise JsonStreamError(f"Ожидалась запятая, получено {char!r}")
+                try:
+                    item, end = _decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    break
+                # Число могло быть обрезано границей куска: "-1" из "-1.5"
+                if not eof and (end == len(buffer) or buffer[end] in _NUMBER_CHARS):
+                    break
+                position = end
+                expect_item = False
+                count += 1
+                yield item
+
+        if finished:
+            break
+        if eof:
+            raise JsonStreamError("Поток закончился до конца массива")
+
+        if position > COMPACT_THRESHOLD:
+            buffer, position = buffer[position:], 0
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buffer += decoder.decode(b"", final=True)
+        else:
+            buffer += decoder.decode(chunk)
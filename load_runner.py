@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный прогон сервиса объявлений на базе ApiClient
+
+С --processes N нагрузку дают N процессов, у каждого свой ApiClient и свои
+потоки: один процесс упирается в GIL и разбор JSON на одном ядре. Процессы
+возвращают гистограммы задержек, контроллер сливает их в один отчет.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import settings
+from ad_payloads import sample_ad_template
+from api_client import (
+    AD_BY_ID,
+    ADS_BY_SELLER,
+    CREATE_AD,
+    DELETE_AD,
+    STATISTICS_V1,
+    STATISTICS_V2,
+    ApiClient,
+    endpoint_name,
+)
+from metrics import EndpointStats, format_ms
+from resilience import CircuitBreaker, RetryPolicy
+
+# Операция -> (метод, шаблон маршрута)
+OPERATIONS = {
+    "create": ("POST", CREATE_AD),
+    "get": ("GET", AD_BY_ID),
+    "seller": ("GET", ADS_BY_SELLER),
+    "stats_v1": ("GET", STATISTICS_V1),
+    "stats_v2": ("GET", STATISTICS_V2),
+    "delete": ("DELETE", DELETE_AD),
+}
+
+DEFAULT_MIX = {"create": 2, "get": 4, "seller": 2, "stats_v1": 2, "stats_v2": 2, "delete": 1}
+
+# Без зарезервированных 111111 (smoke) и 999999 (несуществующий продавец)
+SELLER_ID_RANGE = (settings.SELLER_ID_MIN, settings.SELLER_ID_MAX)
+MAX_POOLED_IDS = 10000
+# Доля целевого RPS, ниже которой отчет предупреждает об отставании от расписания
+SCHEDULE_SLIP_RATIO = 0.95
+
+
+def parse_mix(text):
+    """Разбирает строку вида "create=2,get=4" в словарь весов"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Неизвестная операция: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class AdPool:
+    """Потокобезопасный набор созданных объявлений для GET/DELETE-операций.
+
+    Для выборки держится не больше limit объявлений; созданные сверх него
+    запоминаются только по id, чтобы удалить их в конце прогона.
+    """
+
+    def __init__(self, limit=MAX_POOLED_IDS):
+        self.limit = limit
+        self.ads = []
+        self.overflow = []
+        self.lock = threading.Lock()
+
+    def add(self, ad_id, seller_id):
+        with self.lock:
+            if len(self.ads) < self.limit:
+                self.ads.append((ad_id, seller_id))
+            else:
+                self.overflow.append(ad_id)
+
+    def pick(self, rng):
+        with self.lock:
+            return rng.choice(self.ads) if self.ads else None
+
+    def pop(self, rng):
+        with self.lock:
+            if not self.ads:
+                return None
+            index = rng.randrange(len(self.ads))
+            self.ads[index], self.ads[-1] = self.ads[-1], self.ads[index]
+            return self.ads.pop()
+
+    def drain(self):
+        """id всех еще не удаленных объявлений, включая созданные сверх limit"""
+        with self.lock:
+            ad_ids = [ad_id for ad_id, _ in self.ads] + self.overflow
+            self.ads, self.overflow = [], []
+            return ad_ids
+
+
+class LoadReport:
+    def __init__(self, stats, duration, mode, processes=1, leftovers=0, target_rps=None, scheduled=0, max_lag=0.0):
+        self.stats = stats
+        self.duration = duration
+        self.mode = mode
+        self.processes = processes
+        # Созданные прогоном объявления, которые остались на сервисе
+        self.leftovers = leftovers
+        # Режим --rps: целевой RPS, число слотов расписания за duration
+        # и наибольшее отставание отправки от слота, с
+        self.target_rps = target_rps
+        self.scheduled = scheduled
+        self.max_lag = max_lag
+
+    @property
+    def achieved_rps(self):
+        return self.total().count / self.duration if self.duration else 0.0
+
+    def schedule_slipped(self):
+        """Генератор не выдержал расписание --rps: отправлено заметно меньше запланированных слотов"""
+        return bool(self.scheduled) and self.total().count < self.scheduled * SCHEDULE_SLIP_RATIO
+
+    def total(self):
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.merge(stats)
+        return total
+
+    def to_dict(self):
+        return {
+            "mode": self.mode,
+            "processes": self.processes,
+            "duration": self.duration,
+            "endpoints": {name: stats.summary(self.duration) for name, stats in sorted(self.stats.items())},
+            "total": self.total().summary(self.duration),
+            "leftovers": self.leftovers,
+            "target_rps": self.target_rps,
+            "achieved_rps": self.achieved_rps,
+            "scheduled": self.scheduled,
+            "max_lag": self.max_lag,
+        }
+
+    def format_table(self):
+        header = f"{'endpoint':<32} {'req':>8} {'rps':>9} {'err%':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'p999':>8}"
+        lines = [header, "-" * len(header)]
+        rows = sorted(self.stats.items()) + [("TOTAL", self.total())]
+        for name, stats in rows:
+            summary = stats.summary(self.duration)
+            lines.append(
+                f"{name:<32} {summary['requests']:>8} {summary['rps']:>9.1f} "
+                f"{summary['error_rate'] * 100:>6.2f}% {format_ms(summary['p50']):>8} "
+                f"{format_ms(summary['p90']):>8} {format_ms(summary['p99']):>8} {format_ms(summary['p999']):>8}"
+            )
+        lines.append("(задержки в мс)")
+        return "\n".join(lines)
+
+
+class LoadRunner:
+    """Воспроизводит взвешенную смесь запросов с целевым RPS или фиксированной конкурентностью.
+
+    Без rps каждый из concurrency потоков шлет запросы подряд (закрытая модель);
+    с rps потоки забирают слоты общего расписания start + n / rps (открытая модель).
+    В режиме rps задержка считается от слота, а не от фактической отправки: если
+    потоки не успевают, ожидание в очереди попадает в перцентили (coordinated omission).
+    """
+
+    def __init__(self, client, mix=None, duration=10.0, rps=None, concurrency=16, seed=None, cleanup=True):
+        self.client = client
+        self.mix = mix or DEFAULT_MIX
+        self.duration = duration
+        self.rps = rps
+        self.concurrency = concurrency
+        self.seed = seed
+        self.cleanup = cleanup
+        self.pool = AdPool()
+        # Тело create кодируется один раз, на каждый запрос подставляется только sellerID
+        self.template = sample_ad_template(client.codec)
+        self._operations = list(self.mix)
+        self._weights = [self.mix[name] for name in self._operations]
+        self._slot_lock = threading.Lock()
+        self._slot = 0
+
+    def _next_slot(self, start):
+        with self._slot_lock:
+            slot = start + self._slot / self.rps
+            self._slot += 1
+        return slot
+
+    def _resolve(self, operation, rng):
+        """Выбирает объявление для операции; без созданных объявлений делает create"""
+        if operation == "create":
+            return operation, None
+        ad = self.pool.pop(rng) if operation == "delete" else self.pool.pick(rng)
+        if ad is None:
+            return "create", None
+        return operation, ad
+
+    def _execute(self, operation, ad, rng):
+        if operation == "create":
+            seller_id = rng.randint(*SELLER_ID_RANGE)
+            response = self.client.create_ad(self.template.render(seller_id))
+            if response.status_code == 200:
+                ad_id = self.client.extract_ad_id(response.json())
+                if ad_id:
+                    self.pool.add(ad_id, seller_id)
+            return response
+
+        ad_id, seller_id = ad
+        if operation == "get":
+            return self.client.get_ad_by_id(ad_id)
+        if operation == "seller":
+            return self.client.get_ads_by_seller(seller_id)
+        if operation == "stats_v1":
+            return self.client.get_statistics_v1(ad_id)
+        if operation == "stats_v2":
+            return self.client.get_statistics_v2(ad_id)
+        return self.client.delete_ad(ad_id)
+
+    def _worker(self, index, start, stop_at, results):
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        stats = {}
+        max_lag = 0.0
+        while True:
+            if self.rps:
+                slot = self._next_slot(start)
+                # Слоты, до которых отставший генератор не дошел за duration, не отправляются
+                if slot >= stop_at or time.perf_counter() >= stop_at:
+                    break
+                delay = slot - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    max_lag = max(max_lag, -delay)
+            elif time.perf_counter() >= stop_at:
+                break
+
+            operation, ad = self._resolve(rng.choices(self._operations, self._weights)[0], rng)
+            started = slot if self.rps else time.perf_counter()
+            try:
+                response = self._execute(operation, ad, rng)
+            except Exception:
+                status_code, error = None, True
+            else:
+                status_code, error = response.status_code, response.status_code >= 500
+            elapsed = time.perf_counter() - started
+
+            name = endpoint_name(*OPERATIONS[operation])
+            stats.setdefault(name, EndpointStats()).add(elapsed, status_code, error)
+        results[index] = (stats, max_lag)
+
+    def run(self):
+        results = [({}, 0.0)] * self.concurrency
+        start = time.perf_counter()
+        stop_at = start + self.duration
+        threads = [
+            threading.Thread(target=self._worker, args=(index, start, stop_at, results), daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        # Гистограммы потоков сливаются, а не усредняются
+        merged = {}
+        for stats, _ in results:
+            for name, endpoint_stats in stats.items():
+                merged.setdefault(name, EndpointStats()).merge(endpoint_stats)
+
+        ad_ids = self.pool.drain()
+        leftovers = len(ad_ids)
+        if self.cleanup and ad_ids:
+            leftovers = len(self.client.delete_ads(ad_ids, missing_ok=True).failures)
+
+        mode = f"rps={self.rps}" if self.rps else f"concurrency={self.concurrency}"
+        # Слоты start + n / rps, попавшие в duration
+        scheduled = math.ceil(self.rps * self.duration) if self.rps else 0
+        return LoadReport(merged, elapsed, mode, leftovers=leftovers, target_rps=self.rps, scheduled=scheduled,
+                          max_lag=max(max_lag for _, max_lag in results))
+
+
+# Запас на запуск процессов: все начинают нагрузку в один момент
+PROCESS_START_DELAY = 1.0
+
+
+def build_client(base_url, concurrency, retries, circuit_breaker=False, created_ads=None):
+    """ApiClient для замеров (load_runner.py, soak.py): circuit breaker только по явному флагу.
+
+    Иначе после короткого сбоя отчет наполняется мгновенными отказами без
+    обращения к сети, которые занижают перцентили и завышают долю ошибок
+    """
+    return ApiClient(base_url=base_url, pool_maxsize=concurrency, retry_policy=RetryPolicy(total=retries),
+                     circuit_breaker=CircuitBreaker() if circuit_breaker else False, created_ads=created_ads)
+
+
+def _run_process(options):
+    """Процесс-воркер: свой ApiClient и LoadRunner; возвращает гистограммы в виде to_dict()"""
+    options = dict(options)
+    base_url, retries, start_at = options.pop("base_url"), options.pop("retries"), options.pop("start_at")
+    circuit_breaker = options.pop("circuit_breaker")
+    delay = start_at - time.time()
+    if delay > 0:
+        time.sleep(delay)
+    with build_client(base_url, options["concurrency"], retries, circuit_breaker) as client:
+        report = LoadRunner(client, **options).run()
+    breaker = client.circuit_breaker
+    return {
+        "duration": report.duration,
+        "endpoints": {name: stats.to_dict() for name, stats in report.stats.items()},
+        "retries": dict(client.retry_counts),
+        "rejected": breaker.rejected if breaker is not None else 0,
+        "leftovers": report.leftovers,
+        "scheduled": report.scheduled,
+        "max_lag": report.max_lag,
+    }
+
+
+def run_distributed(processes, base_url=None, retries=0, rps=None, seed=None, circuit_breaker=False, **runner_options):
+    """Запускает LoadRunner в processes процессах; rps делится между ними поровну.
+
+    Возвращает (LoadReport, повторы по эндпоинтам, отклонено circuit breaker).
+    Перцентили отчета считаются по слитым гистограммам процессов, а не усредняются.
+    """
+    concurrency = runner_options.get("concurrency", 16)
+    start_at = time.time() + PROCESS_START_DELAY
+    tasks = [
+        dict(runner_options, base_url=base_url, retries=retries, start_at=start_at, circuit_breaker=circuit_breaker,
+             rps=rps / processes if rps else None,
+             seed=None if seed is None else seed + index * concurrency)
+        for index in range(processes)
+    ]
+    with ProcessPoolExecutor(processes) as executor:
+        results = list(executor.map(_run_process, tasks))
+
+    merged = {}
+    retry_counts = Counter()
+    for result in results:
+        for name, data in result["endpoints"].items():
+            merged.setdefault(name, EndpointStats()).merge(EndpointStats.from_dict(data))
+        retry_counts.update(result["retries"])
+    duration = max(result["duration"] for result in results)
+    mode = f"rps={rps}" if rps else f"concurrency={concurrency}x{processes}"
+    report = LoadReport(merged, duration, mode, processes, sum(result["leftovers"] for result in results),
+                        target_rps=rps, scheduled=sum(result["scheduled"] for result in results),
+                        max_lag=max(result["max_lag"] for result in results))
+    return report, retry_counts, sum(result["rejected"] for result in results)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Нагрузочный прогон эндпоинтов сервиса объявлений')
+    parser.add_argument('--base-url', help='Базовый URL сервиса (по умолчанию из settings.py)')
+    parser.add_argument('--duration', type=float, default=30, help='Длительность прогона, секунды')
+    parser.add_argument('--rps', type=float, help='Целевой RPS (без него - максимальная нагрузка при заданной конкурентности)')
+    parser.add_argument('--concurrency', '-c', type=int, default=16, help='Число параллельных потоков (в каждом процессе)')
+    parser.add_argument('--processes', '-p', type=int, default=1,
+                        help='Число процессов-генераторов нагрузки (0 - по числу ядер)')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help='Веса операций, например "create=2,get=4,seller=2,stats_v1=2,stats_v2=2,delete=1"')
+    parser.add_argument('--seed', type=int, help='Seed генератора для воспроизводимой смеси')
+    parser.add_argument('--no-cleanup', action='store_true', help='Не удалять созданные объявления после прогона')
+    parser.add_argument('--retries', type=int, default=0,
+                        help='Повторы идемпотентных запросов при 5xx (по умолчанию 0, чтобы не маскировать ошибки)')
+    parser.add_argument('--circuit-breaker', action='store_true',
+                        help='Включить circuit breaker (по умолчанию выключен)')
+    parser.add_argument('--json', help='Сохранить отчет в JSON-файл')
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    processes = args.processes or os.cpu_count() or 1
+    runner_options = dict(mix=args.mix, duration=args.duration, rps=args.rps,
+                          concurrency=args.concurrency, seed=args.seed, cleanup=not args.no_cleanup)
+
+    if processes > 1:
+        report, retry_counts, rejected = run_distributed(processes, args.base_url, args.retries,
+                                                         circuit_breaker=args.circuit_breaker, **runner_options)
+    else:
+        with build_client(args.base_url, args.concurrency, args.retries, args.circuit_breaker) as client:
+            report = LoadRunner(client, **runner_options).run()
+        retry_counts = client.retry_counts
+        rejected = client.circuit_breaker.rejected if client.circuit_breaker is not None else 0
+
+    print(f"Режим: {report.mode}, процессов: {report.processes}, длительность: {report.duration:.1f} c")
+    print(report.format_table())
+    if report.target_rps:
+        print(f"RPS: целевой {report.target_rps:g}, достигнутый {report.achieved_rps:.1f}")
+    if report.schedule_slipped():
+        print(f"Внимание: нагрузка отстала от расписания (до {format_ms(report.max_lag)} мс): "
+              f"сервис или генератор не держит целевой RPS, задержки посчитаны от слотов расписания")
+    if retry_counts:
+        print(f"Повторы: {dict(retry_counts)}")
+    if rejected:
+        print(f"Отклонено circuit breaker: {rejected}")
+    if report.leftovers:
+        print(f"Не удалено созданных объявлений: {report.leftovers}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+
+    total = report.total()
+    sys.exit(1 if total.errors else 0)
+
+
+if __name__ == "__main__":
+    main()
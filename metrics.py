@@ -0,0 +1,148 @@
+import math
+from collections import Counter
+
+
+class LatencyHistogram:
+    """Лог-бакетная гистограмма задержек (по схеме DDSketch).
+
+    Квантили считаются с относительной ошибкой не больше relative_accuracy,
+    память не зависит от числа измерений, а две гистограммы сливаются
+    сложением счетчиков бакетов — без усреднения перцентилей.
+    """
+
+    MIN_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = Counter()
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= self.MIN_VALUE:
+            self.zero_count += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self.log_gamma)] += 1
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Нельзя слить гистограммы с разной точностью")
+        self.buckets.update(other.buckets)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def _bucket_value(self, index):
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["relative_accuracy"])
+        histogram.buckets = Counter({int(index): count for index, count in data["buckets"].items()})
+        histogram.zero_count = data["zero_count"]
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = math.inf if data["min"] is None else data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+
+class EndpointStats:
+    """Счетчики и гистограмма задержек одного эндпоинта"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.status_codes = Counter()
+
+    @property
+    def count(self):
+        return self.histogram.count
+
+    def add(self, elapsed, status_code=None, error=False):
+        self.histogram.add(elapsed)
+        if status_code is not None:
+            self.status_codes[status_code] += 1
+        if error:
+            self.errors += 1
+
+    def merge(self, other):
+        self.histogram.merge(other.histogram)
+        self.errors += other.errors
+        self.status_codes.update(other.status_codes)
+        return self
+
+    def summary(self, duration=None):
+        histogram = self.histogram
+        return {
+            "requests": histogram.count,
+            "rps": histogram.count / duration if duration else None,
+            "errors": self.errors,
+            "error_rate": self.errors / histogram.count if histogram.count else 0.0,
+            "mean": histogram.mean,
+            "p50": histogram.quantile(0.50),
+            "p90": histogram.quantile(0.90),
+            "p99": histogram.quantile(0.99),
+            "p999": histogram.quantile(0.999),
+            "max": histogram.max,
+            "status_codes": {str(code): count for code, count in sorted(self.status_codes.items())},
+        }
+
+    def to_dict(self):
+        return {
+            "histogram": self.histogram.to_dict(),
+            "errors": self.errors,
+            "status_codes": {str(code): count for code, count in self.status_codes.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.histogram = LatencyHistogram.from_dict(data["histogram"])
+        stats.errors = data["errors"]
+        stats.status_codes = Counter({int(code): count for code, count in data["status_codes"].items()})
+        return stats
+
+
+def format_ms(seconds):
+    return f"{seconds * 1000:.1f}"
@@ -0,0 +1,86 @@
+import random
+import threading
+import time
+
+import requests
+
+import settings
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Сервис признан недоступным: запрос отклонен без обращения к сети"""
+
+
+class RetryPolicy:
+    """Повторы с экспоненциальной задержкой и full jitter.
+
+    По умолчанию повторяются только идемпотентные методы: POST мог успеть
+    создать объявление до обрыва соединения.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+    RETRY_STATUSES = frozenset([500, 502, 503, 504])
+    RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(self, total=None, backoff_factor=None, max_backoff=None, jitter=True,
+                 methods=IDEMPOTENT_METHODS, statuses=RETRY_STATUSES, exceptions=RETRY_EXCEPTIONS):
+        self.total = settings.RETRY_TOTAL if total is None else total
+        self.backoff_factor = settings.RETRY_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        self.max_backoff = settings.RETRY_MAX_BACKOFF if max_backoff is None else max_backoff
+        self.jitter = jitter
+        self.methods = frozenset(methods)
+        self.statuses = frozenset(statuses)
+        self.exceptions = exceptions
+        self._random = random.Random()
+
+    def retries_for(self, method):
+        return self.total if method in self.methods else 0
+
+    def backoff(self, attempt):
+        """Пауза перед повтором номер attempt + 1"""
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        return self._random.uniform(0, delay) if self.jitter else delay
+
+
+class CircuitBreaker:
+    """Размыкается после failure_threshold сбоев подряд и reset_timeout секунд
+    отклоняет запросы сразу; затем пропускает один пробный запрос (half-open)."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=None, reset_timeout=None, clock=time.monotonic):
+        self.failure_threshold = settings.CIRCUIT_FAILURE_THRESHOLD if failure_threshold is None else failure_threshold
+        self.reset_timeout = settings.CIRCUIT_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.OPEN or (self.state == self.HALF_OPEN and self._trial_in_flight):
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuit breaker разомкнут после {self.failures} сбоев подряд")
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+
+import settings
+
+
+class ResponseCache:
+    """Кеш ответов идемпотентных GET с TTL и вытеснением давно неиспользуемых (LRU).
+
+    Хранятся только ответы 200. Ключ — (маршрут, параметры); у записи есть
+    id объявления и/или продавца, по которым ApiClient сбрасывает ее при
+    create_ad и delete_ad.
+    """
+
+    def __init__(self, max_entries=None, ttl=None, clock=time.monotonic):
+        self.max_entries = settings.RESPONSE_CACHE_SIZE if max_entries is None else max_entries
+        self.ttl = settings.RESPONSE_CACHE_TTL if ttl is None else ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        # ключ -> (истекает, ответ, id объявления, id продавца)
+        self.entries = OrderedDict()
+        # id объявления -> id продавца, известный из закешированных ответов
+        self.ad_sellers = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= self.clock():
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, response, ad_id=None, seller_id=None):
+        if self.max_entries <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (self.clock() + self.ttl, response, ad_id, seller_id)
+            self.entries.move_to_end(key)
+            if ad_id is not None and seller_id is not None:
+                self._remember_seller(ad_id, seller_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def remember_seller(self, ad_id, seller_id):
+        """Продавец объявления, чтобы при его удалении сбросить только нужный листинг"""
+        with self.lock:
+            self._remember_seller(ad_id, seller_id)
+
+    def _remember_seller(self, ad_id, seller_id):
+        self.ad_sellers[ad_id] = seller_id
+        # Забытый продавец лишь значит, что delete_ad сбросит все листинги
+        if len(self.ad_sellers) > self.max_entries * 4:
+            del self.ad_sellers[next(iter(self.ad_sellers))]
+
+    def invalidate(self, ad_id=None, seller_id=None):
+        """Сбрасывает записи объявления и листинг продавца.
+
+        Если продавец удаляемого объявления неизвестен, сбрасываются все листинги.
+        """
+        with self.lock:
+            if ad_id is not None and seller_id is None:
+                seller_id = self.ad_sellers.pop(ad_id, None)
+                all_listings = seller_id is None
+            else:
+                all_listings = False
+            stale = [
+                key for key, (_, _, entry_ad_id, entry_seller_id) in self.entries.items()
+                if (ad_id is not None and entry_ad_id == ad_id)
+                or (entry_ad_id is None and entry_seller_id is not None
+                    and (all_listings or entry_seller_id == seller_id))
+            ]
+            for key in stale:
+                del self.entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.ad_sellers.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
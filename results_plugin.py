@@ -0,0 +1,89 @@
+"""
+Pytest-плагин: дописывает исходы тестов и задержки запросов прогона в историю SQLite.
+
+    pytest --results-db test_results.db                       записать прогон
+    pytest --results-db test_results.db --results-label nightly
+
+Запросы к истории — python results_store.py (см. его описание). Под
+pytest-xdist воркеры передают записи о запросах контроллеру через workeroutput,
+в базу пишет только контроллер.
+"""
+
+import time
+
+import pytest
+
+import settings
+from api_client import add_request_listener, endpoint_name, remove_request_listener
+from results_store import ResultsStore
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("results", "история прогонов")
+    group.addoption("--results-db", metavar="PATH", default=settings.RESULTS_DB or None,
+                    help="Дописать исходы тестов и задержки запросов в SQLite-файл")
+    group.addoption("--results-label", metavar="LABEL", default=settings.RESULTS_LABEL,
+                    help="Метка прогона в истории, например nightly")
+
+
+def pytest_configure(config):
+    if config.getoption("results_db"):
+        config.pluginmanager.register(ResultsRecorder(config), "results_recorder")
+
+
+class ResultsRecorder:
+    def __init__(self, config):
+        self.config = config
+        self.started = time.time()
+        self.current_test = None
+        # (test_id, эндпоинт, статус, задержка)
+        self.requests = []
+        # nodeid -> [исход, длительность тела теста, длительность setup + teardown]
+        self.tests = {}
+        self.run_id = None
+        add_request_listener(self.on_request)
+
+    def on_request(self, record):
+        self.requests.append((self.current_test, endpoint_name(record.method, record.route),
+                              record.status_code, record.elapsed))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        # Запросы фикстур (засев, очистка) пишутся без теста: их вызывает не тело теста
+        self.current_test = item.nodeid
+        yield
+        self.current_test = None
+
+    def pytest_runtest_logreport(self, report):
+        test = self.tests.setdefault(report.nodeid, ["passed", 0.0, 0.0])
+        test[1 if report.when == "call" else 2] += report.duration
+        if test[0] in ("failed", "error"):
+            return
+        if report.failed:
+            test[0] = "failed" if report.when == "call" else "error"
+        elif report.skipped:
+            test[0] = "skipped"
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        self.requests.extend(tuple(record) for record in getattr(node, "workeroutput", {}).get("results_requests", []))
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        remove_request_listener(self.on_request)
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["results_requests"] = [list(record) for record in self.requests]
+            return
+        if not self.tests:
+            return
+        with ResultsStore(self.config.getoption("results_db")) as store:
+            self.run_id = store.record_run(
+                self.started, time.time() - self.started,
+                ((nodeid, *test) for nodeid, test in self.tests.items()),
+                self.requests, label=self.config.getoption("results_label"), exit_status=int(exitstatus),
+            )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.run_id is not None:
+            terminalreporter.write_line(
+                f"История: прогон #{self.run_id} записан в {self.config.getoption('results_db')}")
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+История прогонов в SQLite: исход и длительность каждого теста, задержка каждого запроса.
+
+Длительность теста — только его тело (фаза call), setup и teardown хранятся
+отдельно в fixture_duration. Запросы фикстур записываются без теста.
+
+Записывает плагин results_plugin.py (pytest --results-db PATH). Имена тестов
+и эндпоинтов хранятся один раз в таблице names, строки тестов и запросов —
+только числа, поэтому месяцы ночных прогонов занимают мегабайты. Индексы по
+тесту, эндпоинту и времени прогона держат запросы ниже секунды.
+
+    python results_store.py runs --last 10
+    python results_store.py endpoint "POST /api/1/item" --quantile 0.95 --last 30 --label nightly
+    python results_store.py endpoint create_ad --per-run
+    python results_store.py slower --days 7 --ratio 2
+    python results_store.py test "test_api_v1.py::TestApiV1Positive::test_create_ad_success"
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+
+import settings
+from api_client import CLIENT_METHODS, endpoint_name
+from metrics import LatencyHistogram, format_ms
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    label TEXT NOT NULL DEFAULT '',
+    exit_status INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+CREATE INDEX IF NOT EXISTS runs_label ON runs (label, started);
+
+CREATE TABLE IF NOT EXISTS names (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS tests (
+    run_id INTEGER NOT NULL,
+    test_id INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    fixture_duration REAL,
+    PRIMARY KEY (run_id, test_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tests_test ON tests (test_id, run_id);
+
+CREATE TABLE IF NOT EXISTS requests (
+    run_id INTEGER NOT NULL,
+    endpoint_id INTEGER NOT NULL,
+    test_id INTEGER,
+    status_code INTEGER,
+    elapsed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS requests_endpoint ON requests (endpoint_id, run_id, elapsed);
+CREATE INDEX IF NOT EXISTS requests_test ON requests (test_id, run_id);
+"""
+
+DAY = 24 * 3600
+
+
+def resolve_endpoint(value):
+    """Имя метода ApiClient ("create_ad") или "МЕТОД маршрут" как есть"""
+    if value in CLIENT_METHODS:
+        return endpoint_name(*CLIENT_METHODS[value])
+    return value
+
+
+class ResultsStore:
+    def __init__(self, path=None):
+        self.path = path or settings.RESULTS_DB
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(tests)")]
+        if "fixture_duration" not in columns:
+            # База старой версии: там duration включала setup и teardown
+            self.connection.execute("ALTER TABLE tests ADD COLUMN fixture_duration REAL")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _name_ids(self, names):
+        names = {name for name in names if name is not None}
+        self.connection.executemany("INSERT OR IGNORE INTO names (name) VALUES (?)", ((name,) for name in names))
+        ids = {}
+        names = list(names)
+        # Ограничение SQLite на число параметров запроса
+        for offset in range(0, len(names), 500):
+            chunk = names[offset:offset + 500]
+            rows = self.connection.execute(
+                f"SELECT name, id FROM names WHERE name IN ({','.join('?' * len(chunk))})", chunk)
+            ids.update(rows)
+        return ids
+
+    def _name_id(self, name):
+        row = self.connection.execute("SELECT id FROM names WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def record_run(self, started, duration, tests, requests, label="", exit_status=None):
+        """Добавляет прогон.
+
+        tests: (test_id, исход, длительность тела, длительность setup + teardown);
+        requests: (test_id или None для запросов фикстур, эндпоинт, статус, задержка)
+        """
+        tests, requests = list(tests), list(requests)
+        with self.connection:
+            ids = self._name_ids([test_id for test_id, _, _, _ in tests]
+                                 + [test_id for test_id, _, _, _ in requests]
+                                 + [endpoint for _, endpoint, _, _ in requests])
+            run_id = self.connection.execute(
+                "INSERT INTO runs (started, duration, label, exit_status) VALUES (?, ?, ?, ?)",
+                (started, duration, label or "", exit_status),
+            ).lastrowid
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO tests (run_id, test_id, outcome, duration, fixture_duration) VALUES (?, ?, ?, ?, ?)",
+                ((run_id, ids[test_id], outcome, test_duration, fixture_duration)
+                 for test_id, outcome, test_duration, fixture_duration in tests),
+            )
+            self.connection.executemany(
+                "INSERT INTO requests (run_id, endpoint_id, test_id, status_code, elapsed) VALUES (?, ?, ?, ?, ?)",
+                ((run_id, ids[endpoint], ids.get(test_id), status_code, elapsed)
+                 for test_id, endpoint, status_code, elapsed in requests),
+            )
+        return run_id
+
+    def _last_runs(self, last, label=None):
+        """[(id, started)] последних last прогонов, новые первыми"""
+        if label is None:
+            rows = self.connection.execute("SELECT id, started FROM runs ORDER BY started DESC LIMIT ?", (last,))
+        else:
+            rows = self.connection.execute(
+                "SELECT id, started FROM runs WHERE label = ? ORDER BY started DESC LIMIT ?", (label, last))
+        return rows.fetchall()
+
+    def runs(self, last=20, label=None):
+        """Последние прогоны: (id, started, duration, label, exit_status, {исход: число})"""
+        result = []
+        for run_id, _ in self._last_runs(last, label):
+            run = self.connection.execute(
+                "SELECT id, started, duration, label, exit_status FROM runs WHERE id = ?", (run_id,)).fetchone()
+            outcomes = dict(self.connection.execute(
+                "SELECT outcome, COUNT(*) FROM tests WHERE run_id = ? GROUP BY outcome", (run_id,)))
+            result.append(run + (outcomes,))
+        return result
+
+    def endpoint_latency(self, endpoint, last=30, label=None):
+        """Гистограмма задержек эндпоинта за last прогонов и по каждому: (общая, [(run_id, started, гистограмма)])"""
+        endpoint_id = self._name_id(resolve_endpoint(endpoint))
+        runs = self._last_runs(last, label)
+        total = LatencyHistogram()
+        per_run = []
+        if endpoint_id is None:
+            return total, per_run
+        for run_id, started in reversed(runs):
+            histogram = LatencyHistogram()
+            for (elapsed,) in self.connection.execute(
+                    "SELECT elapsed FROM requests WHERE endpoint_id = ? AND run_id = ?", (endpoint_id, run_id)):
+                histogram.add(elapsed)
+            if histogram.count:
+                total.merge(histogram)
+                per_run.append((run_id, started, histogram))
+        return total, per_run
+
+    def slower_tests(self, days=7, ratio=2.0, baseline_days=30, label=None, now=None):
+        """Тесты, чья средняя длительность за days дней в ratio раз выше, чем за baseline_days дней до этого.
+
+        Учитываются только прошедшие тесты: упавший по таймауту или на первой проверке искажает длительность.
+        Возвращает [(test_id, среднее сейчас, среднее в базе, прогонов сейчас)], самые замедлившиеся первыми.
+        """
+        now = time.time() if now is None else now
+        split = now - days * DAY
+        since = split - baseline_days * DAY
+        query = """
+            SELECT n.name, recent, baseline, recent_runs FROM (
+                SELECT t.test_id,
+                       AVG(CASE WHEN r.started >= :split THEN t.duration END) AS recent,
+                       AVG(CASE WHEN r.started < :split THEN t.duration END) AS baseline,
+                       COUNT(CASE WHEN r.started >= :split THEN 1 END) AS recent_runs
+                FROM runs r JOIN tests t ON t.run_id = r.id
+                WHERE r.started >= :since AND t.outcome = 'passed' {label_filter}
+                GROUP BY t.test_id
+            ) JOIN names n ON n.id = test_id
+            WHERE baseline > 0 AND recent >= baseline * :ratio
+            ORDER BY recent / baseline DESC
+        """.format(label_filter="AND r.label = :label" if label is not None else "")
+        return self.connection.execute(
+            query, {"split": split, "since": since, "ratio": ratio, "label": label}).fetchall()
+
+    def test_history(self, test_id, last=20):
+        """[(run_id, started, исход, длительность тела, длительность фикстур)] теста, новые первыми"""
+        name_id = self._name_id(test_id)
+        if name_id is None:
+            return []
+        return self.connection.execute(
+            """SELECT r.id, r.started, t.outcome, t.duration, t.fixture_duration
+               FROM tests t JOIN runs r ON r.id = t.run_id
+               WHERE t.test_id = ? ORDER BY r.started DESC LIMIT ?""",
+            (name_id, last),
+        ).fetchall()
+
+
+def format_time(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Запросы к истории прогонов тестов')
+    parser.add_argument('--db', default=settings.RESULTS_DB or "test_results.db", help='Файл SQLite с историей')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    runs_parser = commands.add_parser('runs', help='Последние прогоны')
+    runs_parser.add_argument('--last', type=int, default=20, help='Сколько прогонов показать')
+    runs_parser.add_argument('--label', help='Только прогоны с этой меткой (например nightly)')
+
+    endpoint_parser = commands.add_parser('endpoint', help='Перцентиль задержки эндпоинта за последние прогоны')
+    endpoint_parser.add_argument('endpoint', help='"МЕТОД маршрут" или имя метода ApiClient')
+    endpoint_parser.add_argument('--quantile', '-q', type=float, action='append',
+                                 help='Квантиль, например 0.95 (можно несколько раз)')
+    endpoint_parser.add_argument('--last', type=int, default=30, help='Сколько последних прогонов учитывать')
+    endpoint_parser.add_argument('--label', help='Только прогоны с этой меткой')
+    endpoint_parser.add_argument('--per-run', action='store_true', help='Показать значения по каждому прогону')
+
+    slower_parser = commands.add_parser('slower', help='Тесты, которые стали медленнее')
+    slower_parser.add_argument('--days', type=float, default=7, help='Текущий период, дней')
+    slower_parser.add_argument('--baseline-days', type=float, default=30, help='Период сравнения перед ним, дней')
+    slower_parser.add_argument('--ratio', type=float, default=2.0, help='Во сколько раз медленнее')
+    slower_parser.add_argument('--label', help='Только прогоны с этой меткой')
+
+    test_parser = commands.add_parser('test', help='История одного теста')
+    test_parser.add_argument('test_id', help='nodeid теста')
+    test_parser.add_argument('--last', type=int, default=20, help='Сколько прогонов показать')
+
+    args = parser.parse_args()
+
+    with ResultsStore(args.db) as store:
+        if args.command == 'runs':
+            for run_id, started, duration, label, exit_status, outcomes in store.runs(args.last, args.label):
+                counts = ", ".join(f"{outcome}: {count}" for outcome, count in sorted(outcomes.items()))
+                print(f"#{run_id:<5} {format_time(started)} {duration:7.1f} c  код {exit_status}  "
+                      f"{label or '-':<10} {counts}")
+
+        elif args.command == 'endpoint':
+            quantiles = args.quantile or [0.5, 0.95, 0.99]
+            total, per_run = store.endpoint_latency(args.endpoint, args.last, args.label)
+            if not total.count:
+                print(f"Нет запросов к {resolve_endpoint(args.endpoint)}")
+                sys.exit(1)
+            values = "  ".join(f"p{q * 100:g}={format_ms(total.quantile(q))}" for q in quantiles)
+            print(f"{resolve_endpoint(args.endpoint)}: {len(per_run)} прогонов, {total.count} запросов, {values} мс")
+            if args.per_run:
+                for run_id, started, histogram in per_run:
+                    values = "  ".join(f"p{q * 100:g}={format_ms(histogram.quantile(q))}" for q in quantiles)
+                    print(f"  #{run_id:<5} {format_time(started)}  n={histogram.count:<6} {values}")
+
+        elif args.command == 'slower':
+            rows = store.slower_tests(args.days, args.ratio, args.baseline_days, args.label)
+            for test_id, recent, baseline, recent_runs in rows:
+                print(f"x{recent / baseline:5.1f}  {baseline:7.2f} -> {recent:7.2f} c  ({recent_runs} прогонов)  {test_id}")
+            if not rows:
+                print(f"Тестов, замедлившихся в {args.ratio:g} раза и больше, нет")
+
+        elif args.command == 'test':
+            for run_id, started, outcome, duration, fixture_duration in store.test_history(args.test_id, args.last):
+                fixtures = f"  фикстуры {fixture_duration:.2f} c" if fixture_duration is not None else ""
+                print(f"#{run_id:<5} {format_time(started)}  {outcome:<8} {duration:7.2f} c{fixtures}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Неинтерактивный запуск групп тестов (для CI и Docker вместо меню run_tests.sh).
+
+    python run_groups.py smoke v1-negative v2-integration
+    python run_groups.py all -n 4 --stub
+    python run_groups.py --list
+    python run_groups.py negative -- -x --timing      # аргументы после -- уходят в pytest
+
+Все группы идут одной сессией pytest в этом же процессе, параллельно через
+pytest-xdist; код выхода — общий код pytest.
+"""
+
+import argparse
+import importlib.util
+import sys
+
+import pytest
+
+import groups_plugin
+from groups_plugin import GROUPS, V1, V2, expand_group
+
+
+def main():
+    argv = sys.argv[1:]
+    extra = []
+    if "--" in argv:
+        index = argv.index("--")
+        argv, extra = argv[:index], argv[index + 1:]
+
+    parser = argparse.ArgumentParser(description='Запуск групп тестов API одной сессией pytest')
+    parser.add_argument('groups', nargs='*', default=['all'], help='Группы тестов (по умолчанию all)')
+    parser.add_argument('--workers', '-n', default='auto',
+                        help='Число воркеров pytest-xdist (число или auto; 0 — без xdist)')
+    parser.add_argument('--stub', action='store_true', help='Запуск на локальной заглушке сервиса')
+    parser.add_argument('--list', action='store_true', help='Показать группы и выйти')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, entries in GROUPS.items():
+            print(f"{name:<16} {', '.join(entries)}")
+        return 0
+
+    for name in args.groups:
+        if name not in GROUPS:
+            parser.error(f"неизвестная группа {name}, доступны: {', '.join(GROUPS)}")
+
+    # Собираем только файлы, нужные выбранным группам
+    prefixes = [prefix for name in args.groups for prefix in expand_group(name)]
+    files = [path for path in (V1, V2) if any(prefix.split("::")[0] == path for prefix in prefixes)]
+
+    pytest_args = files + [f"--groups={','.join(args.groups)}", "--tb=short"]
+    if args.workers not in ("0", "1") and importlib.util.find_spec("xdist") is not None:
+        pytest_args += ["-n", args.workers]
+    if args.stub:
+        pytest_args.append("--stub")
+    # Модуль уже импортирован здесь: передаем его pytest, чтобы conftest не импортировал повторно
+    return int(pytest.main(pytest_args + extra, plugins=[groups_plugin]))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,12 @@
 #
 # Скрипт для запуска тестов API с привязкой к классам
 #
+# Без аргументов в терминале показывает меню. С аргументами (или без терминала,
+# например в CI) запускает группы одной сессией pytest без вопросов:
+#   ./run_tests.sh smoke v1-negative v2-integration
+#   ./run_tests.sh all -n 4
+#   ./run_tests.sh --list
+#
 
 # Цвета для вывода
 RED='\033[0;31m'
@@ -93,10 +99,14 @@ main() {
         echo "13. Все Smoke тесты"
         echo "14. Все Negative тесты"
         echo "15. Все Integration тесты"
+        echo ""
+        print_menu "=== ПО ЭНДПОИНТАМ ==="
+        echo "16. Только тесты выбранных эндпоинтов"
+        echo "17. Все тесты: сначала часто падающие и быстрые"
         echo "0.  Выход"
         echo ""
         echo "================================================"
-        read -p "Выберите опцию (0-15): " choice
+        read -p "Выберите опцию (0-17): " choice
 
         case $choice in
             # API V1
@@ -147,6 +157,15 @@ main() {
             15)
                 run_tests "python -m pytest test_api_v1.py test_api_v2.py -k \"TestApiV1Integration or TestApiV2Integration\" -v --tb=short" "Все Integration тесты"
                 ;;
+            # ПО ЭНДПОИНТАМ (карта тестов строится по предыдущим прогонам, см. selection_plugin.py)
+            16)
+                echo "Методы ApiClient или маршруты через запятую, например: get_statistics_v2,/api/2/item"
+                read -p "Эндпоинты: " endpoints
+                run_tests "python -m pytest test_api_v1.py test_api_v2.py --endpoints \"$endpoints\" --smart-order -v --tb=short" "Тесты эндпоинтов: $endpoints"
+                ;;
+            17)
+                run_tests "python -m pytest test_api_v1.py test_api_v2.py --smart-order -v --tb=short" "Все тесты в порядке: падавшие, затем быстрые"
+                ;;
             0)
                 print_info "Выход из программы..."
                 exit 0
@@ -160,5 +179,10 @@ main() {
     done
 }
 
-# Запускаем скрипт
+# Запускаем скрипт: группы из аргументов или меню
+if [ $# -gt 0 ]; then
+    exec python run_groups.py "$@"
+elif [ ! -t 0 ]; then
+    exec python run_groups.py all
+fi
 main
\ No newline at end of file
@@ -28,6 +28,11 @@ def main():
     parser.add_argument('--security', action='store_true', help='Запустить только security тесты')
     parser.add_argument('--verbose', '-v', action='store_true', help='Подробный вывод')
     parser.add_argument('--html-report', action='store_true', help='Сгенерировать HTML отчет')
+    parser.add_argument('--workers', '-n', help='Число воркеров pytest-xdist (число или auto)')
+    parser.add_argument('--endpoints', help='Только тесты, вызывающие эти эндпоинты: методы ApiClient или маршруты через запятую')
+    parser.add_argument('--smart-order', action='store_true', help='Сначала часто падающие, затем быстрые тесты')
+    parser.add_argument('--results-db', default='test_results.db', help='SQLite-файл истории прогонов (пусто - не записывать)')
+    parser.add_argument('--results-label', help='Метка прогона в истории, например nightly')
 
     args = parser.parse_args()
 
@@ -68,6 +73,22 @@ def main():
 
     command.extend(["--tb=short", "--color=yes"])
 
+    # Параллельный запуск: sellerID распределяются по воркерам, см. seller_ids.py
+    if args.workers:
+        command.extend(["-n", args.workers])
+
+    # Выбор и порядок по карте "тест -> эндпоинты" из прошлых прогонов, см. selection_plugin.py
+    if args.endpoints:
+        command.extend(["--endpoints", args.endpoints])
+    if args.smart_order:
+        command.append("--smart-order")
+
+    # История прогонов для запросов через results_store.py, см. results_plugin.py
+    if args.results_db:
+        command.append(f"--results-db={args.results_db}")
+    if args.results_label:
+        command.extend(["--results-label", args.results_label])
+
     # HTML отчет
     if args.html_report:
         command.extend(["--html=test_report.html", "--self-contained-html"])
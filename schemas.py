@@ -0,0 +1,158 @@
+"""
+Схемы ответов сервиса объявлений.
+
+Схема один раз компилируется в дерево замыканий, поэтому проверка — это
+только вызовы функций без разбора описания. Проверка не останавливается на
+первой ошибке: SchemaError содержит все нарушения с путями вида $[3].statistics.likes.
+"""
+
+import re
+
+UUID_PATTERN = r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+
+
+class SchemaError(AssertionError):
+    def __init__(self, errors, name="response"):
+        self.errors = errors
+        lines = "\n".join(f"  {path}: {message}" for path, message in errors)
+        super().__init__(f"{name}: {len(errors)} нарушений схемы\n{lines}")
+
+
+def _type_name(value):
+    return type(value).__name__
+
+
+def integer(minimum=None, maximum=None):
+    def check(value, path, errors):
+        if not isinstance(value, int) or isinstance(value, bool):
+            errors.append((path, f"ожидалось целое число, получено {_type_name(value)}"))
+        elif minimum is not None and value < minimum:
+            errors.append((path, f"ожидалось >= {minimum}, получено {value}"))
+        elif maximum is not None and value > maximum:
+            errors.append((path, f"ожидалось <= {maximum}, получено {value}"))
+    return check
+
+
+def string(min_length=0, pattern=None):
+    regex = re.compile(pattern) if pattern else None
+
+    def check(value, path, errors):
+        if not isinstance(value, str):
+            errors.append((path, f"ожидалась строка, получено {_type_name(value)}"))
+        elif len(value) < min_length:
+            errors.append((path, f"ожидалась строка длиной >= {min_length}"))
+        elif regex is not None and not regex.search(value):
+            errors.append((path, f"строка {value[:60]!r} не соответствует {pattern}"))
+    return check
+
+
+def obj(fields, optional=()):
+    """Объект с обязательными полями fields; optional — поля, которых может не быть"""
+    checks = tuple(fields.items())
+    optional = frozenset(optional)
+
+    def check(value, path, errors):
+        if not isinstance(value, dict):
+            errors.append((path, f"ожидался объект, получено {_type_name(value)}"))
+            return
+        for field, field_check in checks:
+            if field in value:
+                field_check(value[field], f"{path}.{field}", errors)
+            elif field not in optional:
+                errors.append((f"{path}.{field}", "обязательное поле отсутствует"))
+    return check
+
+
+def array(items, min_items=0):
+    def check(value, path, errors):
+        if not isinstance(value, list):
+            errors.append((path, f"ожидался массив, получено {_type_name(value)}"))
+            return
+        if len(value) < min_items:
+            errors.append((path, f"ожидалось элементов >= {min_items}, получено {len(value)}"))
+        for index, item in enumerate(value):
+            items(item, f"{path}[{index}]", errors)
+    return check
+
+
+def either(*alternatives):
+    """Значение должно подходить хотя бы под одну из схем"""
+    def check(value, path, errors):
+        attempts = []
+        for alternative in alternatives:
+            alternative_errors = []
+            alternative(value, path, alternative_errors)
+            if not alternative_errors:
+                return
+            attempts.append(alternative_errors)
+        errors.extend(min(attempts, key=len))
+    return check
+
+
+class Schema:
+    def __init__(self, name, check):
+        self.name = name
+        self.check = check
+
+    def errors(self, value):
+        errors = []
+        self.check(value, "$", errors)
+        return errors
+
+    def is_valid(self, value):
+        return not self.errors(value)
+
+    def validate(self, value):
+        """Возвращает value или бросает SchemaError со всеми нарушениями"""
+        errors = self.errors(value)
+        if errors:
+            raise SchemaError(errors, self.name)
+        return value
+
+    def iter_validate(self, items):
+        """Проверяет каждый элемент потока и пропускает его дальше.
+
+        Нарушения копятся и бросаются одним SchemaError, когда поток закончится.
+        """
+        errors = []
+        for index, item in enumerate(items):
+            self.check(item, f"$[{index}]", errors)
+            yield item
+        if errors:
+            raise SchemaError(errors, f"{self.name} stream")
+
+
+_statistics = obj({
+    "likes": integer(minimum=0),
+    "viewCount": integer(minimum=0),
+    "contacts": integer(minimum=0),
+})
+
+_ad = obj({
+    "id": string(pattern=UUID_PATTERN),
+    "sellerId": integer(minimum=1),
+    "name": string(min_length=1),
+    "price": integer(minimum=0),
+    "statistics": _statistics,
+    "createdAt": string(),
+})
+
+STATISTICS = Schema("statistics", _statistics)
+STATISTICS_LIST = Schema("statistics list", array(_statistics))
+AD = Schema("ad", _ad)
+AD_LIST = Schema("ad list", array(_ad))
+# GET /api/1/item/{id} может вернуть как массив из одного объявления, так и объект
+AD_RESPONSE = Schema("ad response", either(array(_ad, min_items=1), _ad))
+CREATE_STATUS = Schema("create status", obj({
+    "status": string(pattern=r"^Сохранили объявление - \S+$"),
+}))
+ERROR = Schema("error", obj({
+    "result": obj({"message": string()}, optional=("message",)),
+    "status": string(),
+}))
+
+
+def single_ad(data):
+    """Проверяет ответ GET /api/1/item/{id} и возвращает объявление как объект"""
+    AD_RESPONSE.validate(data)
+    return data[0] if isinstance(data, list) else data
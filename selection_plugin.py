@@ -0,0 +1,173 @@
+"""
+Pytest-плагин: карта "тест -> эндпоинты API" и выбор/порядок тестов по ней.
+
+Каждый прогон записывает в кеш pytest (.pytest_cache), какие эндпоинты
+ApiClient/AsyncApiClient вызвал каждый тест, сколько он шел и падал ли.
+Следующие прогоны используют эту карту:
+
+    pytest --endpoints /api/2/statistic               только тесты, вызывающие v2-статистику
+    pytest --endpoints get_statistics_v2,delete_ad    по имени метода ApiClient
+    pytest --endpoints "DELETE /api/2/item"           по части имени "МЕТОД маршрут"
+    pytest --smart-order                              сначала часто падающие, затем быстрые тесты
+
+Тесты, которых еще нет в карте (новые, ни разу не запускавшиеся или падавшие
+до первого запроса), при --endpoints не отбрасываются и при --smart-order
+новые идут первыми.
+"""
+
+import pytest
+
+from api_client import CLIENT_METHODS, add_request_listener, endpoint_name, remove_request_listener
+
+CACHE_KEY = "api_tests/endpoint_map"
+# Вес последнего прогона в частоте падений: 0.5 — падение "забывается" за несколько зеленых прогонов
+FAILURE_DECAY = 0.5
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("selection", "выбор и порядок тестов по эндпоинтам API")
+    group.addoption("--endpoints", metavar="LIST",
+                    help="Запустить только тесты, вызывающие эти эндпоинты: методы ApiClient, "
+                         "маршруты или части \"МЕТОД маршрут\" через запятую")
+    group.addoption("--smart-order", action="store_true",
+                    help="Сначала новые и часто падающие тесты, затем по возрастанию длительности")
+
+
+def pytest_configure(config):
+    if getattr(config, "cache", None) is not None:
+        config.pluginmanager.register(SelectionPlugin(config), "endpoint_selection")
+
+
+def function_id(nodeid):
+    """Тест без параметров: кейсы одной функции делят карту (см. case_runner.py)"""
+    return nodeid.split("[", 1)[0]
+
+
+def parse_endpoints(value):
+    """'get_statistics_v2,/api/2/item' -> ["GET /api/2/statistic/{id}", "/api/2/item"]"""
+    patterns = []
+    for token in value.split(","):
+        token = token.strip()
+        if token in CLIENT_METHODS:
+            patterns.append(endpoint_name(*CLIENT_METHODS[token]))
+        elif token:
+            patterns.append(token)
+    return patterns
+
+
+class EndpointMap:
+    def __init__(self, entries=None):
+        # nodeid -> {"endpoints": [...] или None, "duration": с, "failure_rate": 0..1, "runs": n};
+        # None — эндпоинты неизвестны: тест падал, не сделав ни одного запроса
+        self.entries = entries or {}
+        self._functions = None
+
+    @classmethod
+    def load(cls, cache):
+        return cls(cache.get(CACHE_KEY, {}))
+
+    def save(self, cache):
+        cache.set(CACHE_KEY, self.entries)
+
+    def update(self, nodeid, endpoints, duration, failed):
+        entry = self.entries.setdefault(nodeid, {"endpoints": None, "duration": 0.0, "failure_rate": 0.0, "runs": 0})
+        if not failed:
+            entry["endpoints"] = sorted(set(endpoints))
+        elif endpoints or entry["endpoints"] is not None:
+            # Упавший тест мог не дойти до части вызовов — тогда только дополняем карту.
+            # Упавший до первого запроса (например, в setup) остается неизвестным и при
+            # --endpoints запускается, а не отбрасывается навсегда
+            entry["endpoints"] = sorted(set(endpoints) | set(entry["endpoints"] or ()))
+        entry["duration"] = duration
+        entry["failure_rate"] = entry["failure_rate"] * (1 - FAILURE_DECAY) + (FAILURE_DECAY if failed else 0.0)
+        entry["runs"] += 1
+        self._functions = None
+
+    def endpoints(self, nodeid):
+        """Эндпоинты теста вместе с остальными кейсами его функции; None — теста нет в карте"""
+        if self._functions is None:
+            self._functions = {}
+            for known_id, entry in self.entries.items():
+                if entry["endpoints"] is not None:
+                    self._functions.setdefault(function_id(known_id), set()).update(entry["endpoints"])
+        return self._functions.get(function_id(nodeid))
+
+    def touches(self, nodeid, patterns):
+        endpoints = self.endpoints(nodeid)
+        if endpoints is None:
+            return None
+        return any(pattern in endpoint for endpoint in endpoints for pattern in patterns)
+
+    def sort_key(self, nodeid):
+        entry = self.entries.get(nodeid)
+        if entry is None:
+            return (0, 0.0, 0.0)
+        return (1, -entry["failure_rate"], entry["duration"])
+
+
+class SelectionPlugin:
+    def __init__(self, config):
+        self.config = config
+        self.map = EndpointMap.load(config.cache)
+        self.current_test = None
+        # nodeid -> эндпоинты, длительность, упал ли — за текущий прогон
+        self.endpoints = {}
+        self.durations = {}
+        self.failed = set()
+        self.unknown = 0
+        add_request_listener(self.on_request)
+
+    def on_request(self, record):
+        if self.current_test is not None:
+            self.endpoints.setdefault(self.current_test, set()).add(endpoint_name(record.method, record.route))
+
+    def pytest_collection_modifyitems(self, config, items):
+        value = config.getoption("endpoints")
+        if value:
+            patterns = parse_endpoints(value)
+            selected, deselected = [], []
+            for item in items:
+                touches = self.map.touches(item.nodeid, patterns)
+                if touches is None:
+                    self.unknown += 1
+                (deselected if touches is False else selected).append(item)
+            if deselected:
+                config.hook.pytest_deselected(items=deselected)
+                items[:] = selected
+        if config.getoption("smart_order"):
+            items.sort(key=lambda item: self.map.sort_key(item.nodeid))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        # Только тело теста: запросы session-фикстур (seeded_ads) зависят от порядка тестов
+        self.current_test = item.nodeid
+        yield
+        self.current_test = None
+
+    def pytest_runtest_logreport(self, report):
+        # Под xdist контроллер получает отчеты воркеров, так что длительности собираются и здесь
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+        if report.failed:
+            self.failed.add(report.nodeid)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        for nodeid, endpoints in getattr(node, "workeroutput", {}).get("endpoint_map", {}).items():
+            self.endpoints.setdefault(nodeid, set()).update(endpoints)
+
+    def pytest_sessionfinish(self, session):
+        remove_request_listener(self.on_request)
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["endpoint_map"] = {nodeid: sorted(endpoints) for nodeid, endpoints in self.endpoints.items()}
+            return
+        for nodeid, duration in self.durations.items():
+            self.map.update(nodeid, self.endpoints.get(nodeid, ()), duration, nodeid in self.failed)
+        if self.durations:
+            self.map.save(self.config.cache)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.config.getoption("endpoints") and self.unknown:
+            terminalreporter.write_line(
+                f"--endpoints: {self.unknown} тестов без данных в карте эндпоинтов запущены целиком"
+            )
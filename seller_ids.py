@@ -0,0 +1,55 @@
+import hashlib
+import os
+
+import settings
+
+
+def keyed_index(key):
+    """Стабильное между прогонами и процессами число из строки (nodeid теста)"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class SellerIdAllocator:
+    """Выдает sellerID без пересечений между воркерами pytest-xdist.
+
+    Диапазон [low, high] делится на равные блоки по числу воркеров, каждый
+    воркер последовательно идет по своему блоку начиная со смещения seed.
+    При одинаковых seed и числе воркеров последовательность детерминирована.
+
+    С keyed=True (при записи и воспроизведении кассеты) next(key) выводит
+    sellerID из key — nodeid теста, — а не из порядка выдачи: тела запросов
+    не зависят от того, какие тесты собраны, и кассета полного прогона
+    подходит для любого подмножества. Разные ключи совпадают лишь изредка,
+    по совпадению хешей в диапазоне.
+    """
+
+    def __init__(self, worker_index=0, worker_count=1, low=None, high=None, seed=None, keyed=False):
+        low = settings.SELLER_ID_MIN if low is None else low
+        high = settings.SELLER_ID_MAX if high is None else high
+        seed = settings.SELLER_ID_SEED if seed is None else seed
+        self.low = low
+        self.high = high
+        self.keyed = keyed
+        self.block = (high - low + 1) // worker_count
+        if self.block < 1:
+            raise ValueError("Диапазон sellerID меньше числа воркеров")
+        self.start = low + worker_index * self.block
+        self.offset = seed % self.block
+        self.issued = 0
+
+    @classmethod
+    def from_environment(cls, **kwargs):
+        """Номер и число воркеров берутся из переменных, которые выставляет pytest-xdist"""
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+        worker_index = int(worker[2:]) if worker.startswith("gw") else 0
+        worker_count = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", 1))
+        return cls(worker_index, worker_count, **kwargs)
+
+    def next(self, key=None):
+        if self.keyed and key is not None:
+            return self.low + keyed_index(key) % (self.high - self.low + 1)
+        if self.issued >= self.block:
+            raise RuntimeError("Блок sellerID воркера исчерпан")
+        seller_id = self.start + (self.offset + self.issued) % self.block
+        self.issued += 1
+        return seller_id
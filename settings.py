@@ -1 +1,65 @@
-BASE_URL = "https://qa-internship.avito.com"
\ No newline at end of file
+import os
+import time
+
+BASE_URL = os.environ.get("API_BASE_URL", "https://qa-internship.avito.com")
+
+# Пул HTTP-соединений ApiClient
+POOL_CONNECTIONS = int(os.environ.get("API_POOL_CONNECTIONS", 4))  # число хостов, для которых держим пул
+POOL_MAXSIZE = int(os.environ.get("API_POOL_MAXSIZE", 32))  # соединений на один хост
+POOL_BLOCK = os.environ.get("API_POOL_BLOCK", "0") == "1"  # ждать свободное соединение вместо открытия нового
+KEEP_ALIVE = os.environ.get("API_KEEP_ALIVE", "1") == "1"
+
+# Таймауты запросов, секунды
+CONNECT_TIMEOUT = float(os.environ.get("API_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.environ.get("API_READ_TIMEOUT", 30))
+
+# Повторы идемпотентных запросов при 5xx и обрывах соединения
+RETRY_TOTAL = int(os.environ.get("API_RETRY_TOTAL", 2))
+RETRY_BACKOFF_FACTOR = float(os.environ.get("API_RETRY_BACKOFF_FACTOR", 0.2))  # пауза до n-го повтора: до factor * 2**n
+RETRY_MAX_BACKOFF = float(os.environ.get("API_RETRY_MAX_BACKOFF", 5))
+
+# Circuit breaker: после N сбоев подряд запросы отклоняются сразу на RESET_TIMEOUT секунд (0 — выключен)
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("API_CIRCUIT_FAILURE_THRESHOLD", 10))
+CIRCUIT_RESET_TIMEOUT = float(os.environ.get("API_CIRCUIT_RESET_TIMEOUT", 30))
+
+# Кассета для записи/воспроизведения HTTP-обменов (cassette.py, pytest --cassette)
+CASSETTE_PATH = os.environ.get("API_CASSETTE", "")
+CASSETTE_MODE = os.environ.get("API_CASSETTE_MODE", "replay")
+
+# Максимум одновременных запросов в bulk-помощниках AsyncApiClient
+ASYNC_CONCURRENCY = int(os.environ.get("API_ASYNC_CONCURRENCY", 32))
+
+# Запуск тестов на локальной заглушке stub_server.py вместо удаленного сервиса (то же, что pytest --stub)
+USE_STUB = os.environ.get("API_USE_STUB", "0") == "1"
+
+# Диапазон sellerID для тестовых данных. Крайние значения зарезервированы:
+# 111111 — smoke-проверка подключения, 999999 — заведомо несуществующий продавец
+SELLER_ID_MIN = 111112
+SELLER_ID_MAX = 999998
+SMOKE_SELLER_ID = 111111
+NONEXISTENT_SELLER_ID = 999999
+# Смещение внутри блока воркера: разные значения дают разных продавцов между прогонами.
+# По умолчанию свое на каждый прогон; pytest печатает его в заголовке для повтора
+SELLER_ID_SEED = int(os.environ.get("API_SELLER_ID_SEED") or (time.time_ns() // 1000 ^ os.getpid()) % 1000000)
+
+# Сколько объявлений создается заранее для read-only тестов (фикстура seeded_ad)
+SEED_POOL_SIZE = int(os.environ.get("API_SEED_POOL_SIZE", 8))
+
+# Сколько кейсов параметризованного теста отправляется одновременно (case_runner.py).
+# Сверх POOL_MAXSIZE соединения открываются на время группы и не возвращаются в пул
+CASE_BATCH_WORKERS = int(os.environ.get("API_CASE_BATCH_WORKERS", 64))
+
+# История прогонов в SQLite (results_plugin.py, results_store.py); пусто — не записывать
+RESULTS_DB = os.environ.get("API_RESULTS_DB", "")
+RESULTS_LABEL = os.environ.get("API_RESULTS_LABEL", "")
+
+# Размер страницы листинга продавца в ApiClient.iter_ads_by_seller (limit/offset); 0 — один запрос
+SELLER_PAGE_SIZE = int(os.environ.get("API_SELLER_PAGE_SIZE", 100))
+
+# Кеш GET-ответов ApiClient (response_cache.py): включен ли по умолчанию, число записей и время жизни, с
+RESPONSE_CACHE = os.environ.get("API_RESPONSE_CACHE", "0") == "1"
+RESPONSE_CACHE_SIZE = int(os.environ.get("API_RESPONSE_CACHE_SIZE", 1024))
+RESPONSE_CACHE_TTL = float(os.environ.get("API_RESPONSE_CACHE_TTL", 30))
+
+# JSON-кодек клиентов (json_codec.py): auto — orjson или msgspec, если установлены; json — стандартный модуль
+JSON_CODEC = os.environ.get("API_JSON_CODEC", "auto")
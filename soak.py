@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Soak-прогон: полный жизненный цикл объявления с постоянной частотой на часы.
+
+Каждый цикл повторяет test_full_ad_lifecycle и test_complete_ad_lifecycle_v2:
+создание -> получение -> статистика v1 и v2 -> удаление -> проверка, что
+объявление удалено. Каждые --window секунд фиксируется окно: перцентили
+задержек по эндпоинтам, доля ошибок, RSS процесса, открытые сокеты и потоки.
+Первые --baseline окон задают базу; скользящие перцентили последних
+--rolling окон и ресурсы сравниваются с ней, выход за пороги печатается
+сразу и дает код выхода 1.
+
+    python soak.py --duration 4h --rate 5 --window 60 --jsonl soak.jsonl
+    python soak.py --duration 10m --rate 20 --max-latency-drift 1.3 --max-rss-growth-mb 20
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import settings
+from ad_payloads import sample_ad_template
+from ad_registry import AdRegistry
+from api_client import CLIENT_METHODS, endpoint_name
+from load_runner import build_client
+from metrics import EndpointStats, format_ms
+
+# Шаг цикла -> (метод ApiClient, допустимые статусы)
+LIFECYCLE = [
+    ("create", "create_ad", (200,)),
+    ("get", "get_ad_by_id", (200,)),
+    ("stats_v1", "get_statistics_v1", (200, 404)),
+    ("stats_v2", "get_statistics_v2", (200, 404)),
+    ("delete", "delete_ad", (200,)),
+    ("get_deleted", "get_ad_by_id", (400, 404)),
+]
+
+# Минимум запросов эндпоинта в базе и в скользящем окне, чтобы сравнивать p99
+MIN_SAMPLES = 100
+
+Resources = namedtuple("Resources", "rss_bytes sockets fds threads")
+
+
+def parse_duration(text):
+    """'90' -> 90, '30m' -> 1800, '2h' -> 7200 (секунды)"""
+    text = str(text).strip()
+    units = {"s": 1, "m": 60, "h": 3600}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def process_resources():
+    """RSS, открытые сокеты, дескрипторы и потоки текущего процесса (Linux /proc; иначе None)"""
+    rss_bytes = None
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss_bytes = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    sockets = fds = None
+    try:
+        names = os.listdir("/proc/self/fd")
+    except OSError:
+        pass
+    else:
+        fds = len(names)
+        sockets = 0
+        for name in names:
+            try:
+                if os.readlink(f"/proc/self/fd/{name}").startswith("socket:"):
+                    sockets += 1
+            except OSError:
+                continue
+    return Resources(rss_bytes, sockets, fds, threading.active_count())
+
+
+class SoakWindow:
+    def __init__(self, index, started):
+        self.index = index
+        self.started = started
+        self.duration = 0.0
+        self.stats = {}
+        self.lifecycles = 0
+        self.failed_lifecycles = 0
+        self.resources = None
+        self.closed_at = None
+
+    def add(self, name, elapsed, status_code, error):
+        self.stats.setdefault(name, EndpointStats()).add(elapsed, status_code, error)
+
+    def total(self):
+        return merge_stats([self]).get("TOTAL", EndpointStats())
+
+    def to_dict(self):
+        return {
+            "index": self.index,
+            "started": self.started,
+            "duration": self.duration,
+            "closed_at": self.closed_at,
+            "lifecycles": self.lifecycles,
+            "failed_lifecycles": self.failed_lifecycles,
+            "resources": self.resources._asdict() if self.resources else None,
+            "endpoints": {name: stats.summary(self.duration) for name, stats in sorted(self.stats.items())},
+        }
+
+
+def merge_stats(windows):
+    """Слитые по окнам EndpointStats по эндпоинтам, плюс "TOTAL" по всем"""
+    merged = {}
+    for window in windows:
+        for name, stats in window.stats.items():
+            merged.setdefault(name, EndpointStats()).merge(stats)
+            merged.setdefault("TOTAL", EndpointStats()).merge(stats)
+    return merged
+
+
+class DriftDetector:
+    """Сравнивает скользящее окно с базой из первых окон прогона"""
+
+    def __init__(self, baseline_windows=3, rolling_windows=5, max_latency_drift=1.5,
+                 max_error_rate_increase=0.01, max_rss_growth_mb=50, max_socket_growth=10):
+        self.baseline_windows = baseline_windows
+        self.rolling_windows = rolling_windows
+        self.max_latency_drift = max_latency_drift
+        self.max_error_rate_increase = max_error_rate_increase
+        self.max_rss_growth = max_rss_growth_mb * 1024 * 1024
+        self.max_socket_growth = max_socket_growth
+        self.baseline = None
+        self.baseline_resources = None
+
+    def check(self, windows):
+        """Нарушения порогов для последнего окна: список строк"""
+        if len(windows) < self.baseline_windows:
+            return []
+        if self.baseline is None:
+            self.baseline = merge_stats(windows[:self.baseline_windows])
+            self.baseline_resources = windows[self.baseline_windows - 1].resources
+            return []
+
+        problems = []
+        rolling = merge_stats(windows[self.baseline_windows:][-self.rolling_windows:])
+        for name, stats in sorted(rolling.items()):
+            base = self.baseline.get(name)
+            if base is None or base.count < MIN_SAMPLES or stats.count < MIN_SAMPLES:
+                continue
+            base_p99, p99 = base.histogram.quantile(0.99), stats.histogram.quantile(0.99)
+            if base_p99 and p99 > base_p99 * self.max_latency_drift:
+                problems.append(f"p99 {name}: {format_ms(p99)} мс против {format_ms(base_p99)} мс в базе "
+                                f"(x{p99 / base_p99:.2f} > x{self.max_latency_drift})")
+
+        base_total, total = self.baseline.get("TOTAL"), rolling.get("TOTAL")
+        if base_total and total and total.count:
+            base_rate = base_total.errors / base_total.count if base_total.count else 0.0
+            rate = total.errors / total.count
+            if rate - base_rate > self.max_error_rate_increase:
+                problems.append(f"доля ошибок {rate * 100:.2f}% против {base_rate * 100:.2f}% в базе")
+
+        base, current = self.baseline_resources, windows[-1].resources
+        if base and current:
+            if base.rss_bytes is not None and current.rss_bytes - base.rss_bytes > self.max_rss_growth:
+                problems.append(f"RSS вырос на {(current.rss_bytes - base.rss_bytes) / 2 ** 20:.1f} МБ "
+                                f"({base.rss_bytes / 2 ** 20:.1f} -> {current.rss_bytes / 2 ** 20:.1f})")
+            if base.sockets is not None and current.sockets - base.sockets > self.max_socket_growth:
+                problems.append(f"открытых сокетов {current.sockets} против {base.sockets} в базе")
+        return problems
+
+
+class SoakRunner:
+    """Циклы жизни объявления с частотой rate в секунду в concurrency потоков"""
+
+    def __init__(self, client, rate, duration, window=60, concurrency=8, detector=None,
+                 registry=None, on_window=None, seed=None):
+        self.client = client
+        self.rate = rate
+        self.duration = duration
+        self.window_length = window
+        self.concurrency = concurrency
+        self.detector = detector or DriftDetector()
+        self.registry = registry
+        self.on_window = on_window
+        self.seed = seed
+        self.windows = []
+        self.drifts = []
+        self.lock = threading.Lock()
+        self.slot = 0
+        self.current = None
+        self.template = sample_ad_template(client.codec)
+
+    def _next_slot(self, start):
+        with self.lock:
+            slot = start + self.slot / self.rate
+            self.slot += 1
+        return slot
+
+    def _record(self, name, elapsed, status_code, error):
+        with self.lock:
+            self.current.add(name, elapsed, status_code, error)
+
+    def _lifecycle(self, rng):
+        ad_id = None
+        failed = False
+        for step, method, expected in LIFECYCLE:
+            if step == "create":
+                args = (self.template.render(rng.randint(settings.SELLER_ID_MIN, settings.SELLER_ID_MAX)),)
+            else:
+                args = (ad_id,)
+            started = time.perf_counter()
+            try:
+                response = getattr(self.client, method)(*args)
+            except Exception:
+                status_code = None
+            else:
+                status_code = response.status_code
+            error = status_code not in expected
+            self._record(endpoint_name(*CLIENT_METHODS[method]), time.perf_counter() - started, status_code, error)
+            failed = failed or error
+            if step == "create":
+                ad_id = self.client.extract_ad_id(response.json()) if status_code == 200 else None
+                if ad_id is None:
+                    break
+            elif step == "delete" and not error and self.registry is not None:
+                self.registry.discard(ad_id)
+        with self.lock:
+            self.current.lifecycles += 1
+            self.current.failed_lifecycles += failed
+
+    def _worker(self, index, start, stop_at):
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        while True:
+            slot = self._next_slot(start)
+            if slot >= stop_at:
+                return
+            delay = slot - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self._lifecycle(rng)
+
+    def _close_window(self, now):
+        with self.lock:
+            window, self.current = self.current, SoakWindow(self.current.index + 1, now)
+        window.duration = now - window.started
+        window.resources = process_resources()
+        window.closed_at = time.time()
+        self.windows.append(window)
+        problems = self.detector.check(self.windows)
+        self.drifts.extend((window.index, problem) for problem in problems)
+        if self.on_window:
+            self.on_window(window, problems, self)
+
+    def run(self):
+        start = time.perf_counter()
+        stop_at = start + self.duration
+        self.current = SoakWindow(0, start)
+        threads = [threading.Thread(target=self._worker, args=(index, start, stop_at), daemon=True)
+                   for index in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        next_window = start + self.window_length
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=max(0.0, next_window - time.perf_counter()))
+                if time.perf_counter() >= next_window:
+                    break
+            if time.perf_counter() >= next_window:
+                self._close_window(time.perf_counter())
+                next_window += self.window_length
+        if self.current.lifecycles:
+            self._close_window(time.perf_counter())
+        return self.windows
+
+
+def format_window(window, runner):
+    total = window.total()
+    summary = total.summary(window.duration)
+    rolling = merge_stats(runner.windows[-runner.detector.rolling_windows:]).get("TOTAL", EndpointStats())
+    resources = window.resources
+    elapsed = int(window.started - runner.windows[0].started + window.duration)
+    rss = f"{resources.rss_bytes / 2 ** 20:.1f} МБ" if resources.rss_bytes is not None else "-"
+    return (
+        f"[{elapsed // 3600:02d}:{elapsed // 60 % 60:02d}:{elapsed % 60:02d}] "
+        f"циклов {window.lifecycles} ({window.lifecycles / window.duration:.1f}/с), "
+        f"ошибок {summary['error_rate'] * 100:.2f}%, "
+        f"p50/p99 {format_ms(summary['p50'])}/{format_ms(summary['p99'])} мс "
+        f"(скользящее p99 {format_ms(rolling.histogram.quantile(0.99))} мс), "
+        f"RSS {rss}, сокетов {resources.sockets}, потоков {resources.threads}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Soak-прогон жизненного цикла объявления')
+    parser.add_argument('--base-url', help='Базовый URL сервиса (по умолчанию из settings.py)')
+    parser.add_argument('--duration', type=parse_duration, default="1h", help='Длительность: 90, 30m, 4h')
+    parser.add_argument('--rate', type=float, default=2, help='Циклов жизни объявления в секунду')
+    parser.add_argument('--concurrency', '-c', type=int, default=8, help='Число потоков')
+    parser.add_argument('--window', type=parse_duration, default="60", help='Длина окна статистики: 60, 5m')
+    parser.add_argument('--baseline', type=int, default=3, help='Сколько первых окон считать базой')
+    parser.add_argument('--rolling', type=int, default=5, help='Сколько последних окон в скользящих перцентилях')
+    parser.add_argument('--max-latency-drift', type=float, default=1.5, help='Допустимый рост p99 относительно базы, раз')
+    parser.add_argument('--max-error-rate-increase', type=float, default=0.01, help='Допустимый рост доли ошибок (0.01 = +1%%)')
+    parser.add_argument('--max-rss-growth-mb', type=float, default=50, help='Допустимый рост RSS клиента, МБ')
+    parser.add_argument('--max-socket-growth', type=int, default=10, help='Допустимый рост числа открытых сокетов')
+    parser.add_argument('--seed', type=int, help='Seed генератора sellerID')
+    parser.add_argument('--jsonl', help='Дописывать окна в JSONL-файл по мере прогона')
+    parser.add_argument('--circuit-breaker', action='store_true',
+                        help='Включить circuit breaker (по умолчанию выключен)')
+    args = parser.parse_args()
+
+    detector = DriftDetector(args.baseline, args.rolling, args.max_latency_drift, args.max_error_rate_increase,
+                             args.max_rss_growth_mb, args.max_socket_growth)
+    output = open(args.jsonl, "a", encoding="utf-8") if args.jsonl else None
+
+    def on_window(window, problems, runner):
+        print(format_window(window, runner), flush=True)
+        for problem in problems:
+            print(f"  ДРЕЙФ: {problem}", flush=True)
+        if output:
+            output.write(json.dumps({**window.to_dict(), "drift": problems}, ensure_ascii=False) + "\n")
+            output.flush()
+
+    registry = AdRegistry()
+    try:
+        with build_client(args.base_url, args.concurrency, retries=0, circuit_breaker=args.circuit_breaker,
+                          created_ads=registry) as client:
+            runner = SoakRunner(client, args.rate, args.duration, args.window, args.concurrency,
+                                detector, registry, on_window, args.seed)
+            runner.run()
+    finally:
+        leftovers = registry.sweep(base_url=args.base_url)
+        if output:
+            output.close()
+
+    total = merge_stats(runner.windows).get("TOTAL", EndpointStats())
+    lifecycles = sum(window.lifecycles for window in runner.windows)
+    failed = sum(window.failed_lifecycles for window in runner.windows)
+    print(f"Итого: {lifecycles} циклов, неудачных {failed}, запросов {total.count}, "
+          f"p99 {format_ms(total.histogram.quantile(0.99))} мс, окон с дрейфом {len({index for index, _ in runner.drifts})}")
+    if leftovers:
+        print(f"Не удалось удалить объявления: {len(leftovers)}")
+    sys.exit(1 if runner.drifts else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Локальная заглушка микросервиса объявлений.
+
+Обслуживает те же шесть маршрутов, что использует ApiClient, и отдает ответы
+той же формы, что и удаленный сервис. Валидация реализует ожидаемое поведение
+из TESTCASES.md (т.е. без багов из BUGS.md), поэтому прогон на заглушке
+проверяет сам тестовый набор, а не сервис.
+
+Запуск на локальном порту:  python stub_server.py --port 8080
+Внутри pytest:              pytest --stub
+"""
+
+import argparse
+import json
+import re
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+MAX_SELLER_ID = 2 ** 31 - 1
+MAX_NAME_LENGTH = 255
+STATISTICS_FIELDS = ("likes", "viewCount", "contacts")
+HTML_TAG = re.compile(r"<[^>]*>")
+
+ROUTES = [
+    ("POST", re.compile(r"^/api/1/item$"), "create"),
+    ("GET", re.compile(r"^/api/1/item/([^/]+)$"), "get"),
+    ("GET", re.compile(r"^/api/1/statistic/([^/]+)$"), "statistics"),
+    ("GET", re.compile(r"^/api/2/statistic/([^/]+)$"), "statistics"),
+    ("DELETE", re.compile(r"^/api/2/item/([^/]+)$"), "delete"),
+    ("GET", re.compile(r"^/api/1/([^/]+)/item$"), "list_by_seller"),
+]
+
+
+def error(status, message):
+    return status, {"result": {"message": message, "messages": {}}, "status": str(status)}
+
+
+def is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def validate_ad(body):
+    """Возвращает текст ошибки валидации или None"""
+    if not isinstance(body, dict) or not body:
+        return "не передано тело объявления"
+    seller_id = body.get("sellerID")
+    if not is_int(seller_id) or not 1 <= seller_id <= MAX_SELLER_ID:
+        return f"поле sellerID должно быть целым числом от 1 до {MAX_SELLER_ID}"
+    name = body.get("name")
+    if not isinstance(name, str) or not name.strip():
+        return "поле name обязательно"
+    if len(name) > MAX_NAME_LENGTH:
+        return f"поле name не должно быть длиннее {MAX_NAME_LENGTH} символов"
+    if HTML_TAG.search(name):
+        return "поле name не должно содержать HTML-теги"
+    price = body.get("price")
+    if not is_int(price) or price < 0:
+        return "поле price должно быть неотрицательным целым числом"
+    statistics = body.get("statistics")
+    if not isinstance(statistics, dict):
+        return "поле statistics обязательно"
+    for field in STATISTICS_FIELDS:
+        value = statistics.get(field)
+        if not is_int(value) or value < 0:
+            return f"поле statistics.{field} должно быть неотрицательным целым числом"
+    return None
+
+
+class AdStore:
+    """Хранилище объявлений заглушки; все операции — O(1) по id и продавцу"""
+
+    def __init__(self, paging=True, ignore_offset=False):
+        self.lock = threading.Lock()
+        self.ads = {}
+        self.by_seller = {}
+        # limit/offset в листинге продавца; False — как удаленный сервис, который их игнорирует
+        self.paging = paging
+        # limit соблюдается, offset игнорируется: каждая страница — начало списка
+        self.ignore_offset = ignore_offset
+
+    def clear(self):
+        with self.lock:
+            self.ads.clear()
+            self.by_seller.clear()
+
+    def create(self, body):
+        message = validate_ad(body)
+        if message:
+            return error(400, message)
+        ad_id = str(uuid.uuid4())
+        ad = {
+            "createdAt": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f +0000 UTC"),
+            "id": ad_id,
+            "name": body["name"],
+            "price": body["price"],
+            "sellerId": body["sellerID"],
+            "statistics": {field: body["statistics"][field] for field in STATISTICS_FIELDS},
+        }
+        with self.lock:
+            self.ads[ad_id] = ad
+            self.by_seller.setdefault(ad["sellerId"], {})[ad_id] = None
+        return 200, {"status": f"Сохранили объявление - {ad_id}"}
+
+    def _find(self, ad_id):
+        try:
+            uuid.UUID(ad_id)
+        except ValueError:
+            return None, error(400, "передан некорректный идентификатор объявления")
+        ad = self.ads.get(ad_id)
+        if ad is None:
+            return None, error(404, f"item {ad_id} not found")
+        return ad, None
+
+    def get(self, ad_id):
+        ad, failure = self._find(ad_id)
+        return failure or (200, [ad])
+
+    def statistics(self, ad_id):
+        ad, failure = self._find(ad_id)
+        return failure or (200, [dict(ad["statistics"])])
+
+    def delete(self, ad_id):
+        with self.lock:
+            ad, failure = self._find(ad_id)
+            if failure:
+                return failure
+            del self.ads[ad_id]
+            seller_ads = self.by_seller[ad["sellerId"]]
+            del seller_ads[ad_id]
+            if not seller_ads:
+                del self.by_seller[ad["sellerId"]]
+        return 200, None
+
+    def list_by_seller(self, seller_id, query=""):
+        try:
+            seller_id = int(seller_id)
+        except ValueError:
+            return error(400, "передан некорректный идентификатор продавца")
+        offset, limit = 0, None
+        if self.paging and query:
+            params = parse_qs(query)
+            try:
+                offset = int(params.get("offset", ["0"])[0])
+                limit = int(params["limit"][0]) if "limit" in params else None
+            except ValueError:
+                return error(400, "limit и offset должны быть целыми числами")
+            if offset < 0 or (limit is not None and limit < 1):
+                return error(400, "limit должен быть положительным, offset — неотрицательным")
+            if self.ignore_offset:
+                offset = 0
+        with self.lock:
+            ad_ids = list(self.by_seller.get(seller_id, ()))
+            if not ad_ids:
+                return error(404, f"seller {seller_id} has no items")
+            end = None if limit is None else offset + limit
+            ads = [self.ads[ad_id] for ad_id in ad_ids[offset:end]]
+        return 200, ads
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        path, _, query = self.path.partition("?")
+        body = None
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            raw = self.rfile.read(length)
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                body = None
+
+        store = self.server.store
+        for route_method, pattern, action in ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                if action == "create":
+                    status, payload = store.create(body)
+                elif action == "list_by_seller":
+                    status, payload = store.list_by_seller(match.group(1), query)
+                else:
+                    status, payload = getattr(store, action)(match.group(1))
+                break
+        else:
+            status, payload = error(404, "route not found")
+        self._send(status, payload)
+
+    def _send(self, status, payload):
+        data = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Стандартная очередь в 5 соединений теряет SYN при параллельных клиентах (+1 с на повтор)
+    request_queue_size = 1024
+
+
+class StubServer:
+    """Заглушка на локальном порту; работает в фоновом потоке текущего процесса"""
+
+    def __init__(self, host="127.0.0.1", port=0, store=None):
+        self.httpd = StubHTTPServer((host, port), StubRequestHandler)
+        self.httpd.store = store or AdStore()
+        self.thread = None
+
+    @property
+    def store(self):
+        return self.httpd.store
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Локальная заглушка сервиса объявлений')
+    parser.add_argument('--host', default='127.0.0.1', help='Адрес для прослушивания')
+    parser.add_argument('--port', type=int, default=8080, help='Порт для прослушивания')
+    parser.add_argument('--no-paging', action='store_true',
+                        help='Игнорировать limit/offset в листинге продавца, как удаленный сервис')
+    parser.add_argument('--ignore-offset', action='store_true',
+                        help='Соблюдать limit, но игнорировать offset в листинге продавца')
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, AdStore(paging=not args.no_paging, ignore_offset=args.ignore_offset))
+    print(f"Заглушка слушает {server.url}", flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+import settings
+from ad_payloads import sample_ad_payload
+from async_api_client import AsyncApiClient
+from stub_server import StubServer
+
+
+def run_map(func, items, concurrency, return_exceptions=False):
+    async def run():
+        async with AsyncApiClient(base_url="http://127.0.0.1:1") as client:
+            return await client.map(func, items, concurrency, return_exceptions)
+    return asyncio.run(run())
+
+
+class TestAsyncApiClientMap:
+    """Ограничение параллельности и обработка ошибок в AsyncApiClient.map"""
+
+    def test_results_in_items_order(self):
+        async def func(item):
+            # Поздние элементы завершаются раньше ранних
+            await asyncio.sleep((10 - item) / 1000)
+            return item * 2
+
+        assert run_map(func, range(10), concurrency=4) == [item * 2 for item in range(10)]
+
+    def test_concurrency_limit(self):
+        active, peak = 0, 0
+
+        async def func(item):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.001)
+            active -= 1
+
+        run_map(func, range(20), concurrency=3)
+        assert peak == 3
+
+    def test_reads_items_lazily(self):
+        consumed = []
+
+        def items():
+            for item in range(10):
+                consumed.append(item)
+                yield item
+
+        async def func(item):
+            # Каждый вызов видит, что генератор прочитан не дальше запущенных воркеров
+            assert len(consumed) <= item + 2
+            await asyncio.sleep(0)
+
+        run_map(func, items(), concurrency=2)
+        assert consumed == list(range(10))
+
+    def test_failure_stops_other_workers(self):
+        """Первая ошибка отменяет воркеров: остальные items не отправляются"""
+        calls = []
+        cancelled = []
+
+        async def func(item):
+            calls.append(item)
+            if item == 6:
+                raise ValueError(item)
+            try:
+                await asyncio.sleep(0.01)
+            except asyncio.CancelledError:
+                cancelled.append(item)
+                raise
+            return item
+
+        async def run():
+            async with AsyncApiClient(base_url="http://127.0.0.1:1") as client:
+                with pytest.raises(ValueError):
+                    await client.map(func, range(100), concurrency=4)
+                # Цикл событий еще жив: оставшиеся воркеры успели бы дочитать items
+                await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+        assert len(calls) < 12
+        assert cancelled
+
+    def test_return_exceptions(self):
+        async def func(item):
+            if item % 3 == 0:
+                raise ValueError(item)
+            return item
+
+        results = run_map(func, range(7), concurrency=2, return_exceptions=True)
+        assert [isinstance(result, ValueError) for result in results] == [item % 3 == 0 for item in range(7)]
+        assert [result for result in results if not isinstance(result, ValueError)] == [1, 2, 4, 5]
+
+
+class TestAsyncApiClientStub:
+    """Bulk-помощники на локальной заглушке"""
+
+    def test_create_and_get_ads(self, monkeypatch):
+        monkeypatch.setattr(settings, "CASSETTE_PATH", "")
+        payloads = [sample_ad_payload(settings.SMOKE_SELLER_ID, name=f"async {index}") for index in range(8)]
+
+        async def run(url):
+            async with AsyncApiClient(base_url=url, concurrency=3) as client:
+                created = await client.create_ads(payloads)
+                ad_ids = [client.extract_ad_id(response.json()) for response in created]
+                return ad_ids, await client.get_ads(ad_ids)
+
+        with StubServer() as server:
+            ad_ids, responses = asyncio.run(run(server.url))
+
+        assert all(ad_id is not None for ad_id in ad_ids)
+        names = [response.json()[0]["name"] for response in responses]
+        assert names == [payload["name"] for payload in payloads]
@@ -0,0 +1,89 @@
+from itertools import combinations, product
+
+import pytest
+
+from case_generator import BOUNDARY, FIELDS, SIGN, field_values, make_case, pairwise, pairwise_cases
+
+
+def uncovered_pairs(parameters, rows):
+    """Пары значений двух разных параметров, которых нет ни в одной строке"""
+    missing = []
+    for a, b in combinations(parameters, 2):
+        for i, j in product(range(len(parameters[a])), range(len(parameters[b]))):
+            if not any(row[a] == parameters[a][i] and row[b] == parameters[b][j] for row in rows):
+                missing.append((a, parameters[a][i], b, parameters[b][j]))
+    return missing
+
+
+class TestPairwise:
+    """Покрытие пар жадным pairwise"""
+
+    @pytest.mark.parametrize("sizes", [(2, 2), (3, 3, 3), (4, 2, 3, 5), (5, 5, 5, 5, 5), (1, 6, 2)])
+    def test_covers_all_pairs(self, sizes):
+        parameters = {f"p{index}": [f"p{index}v{value}" for value in range(size)] for index, size in enumerate(sizes)}
+        rows = pairwise(parameters)
+        assert uncovered_pairs(parameters, rows) == []
+        assert all(set(row) == set(parameters) for row in rows)
+
+    def test_fewer_rows_than_product(self):
+        parameters = {f"p{index}": list(range(4)) for index in range(6)}
+        rows = pairwise(parameters)
+        # Нижняя граница — произведение двух самых больших наборов
+        assert 16 <= len(rows) <= 30
+        assert len(rows) < 4 ** 6
+
+    def test_two_parameters_full_product(self):
+        rows = pairwise({"a": [1, 2, 3], "b": ["x", "y"]})
+        assert sorted((row["a"], row["b"]) for row in rows) == sorted(product([1, 2, 3], ["x", "y"]))
+
+    def test_single_parameter(self):
+        assert pairwise({"a": [1, 2, 3]}) == [{"a": 1}, {"a": 2}, {"a": 3}]
+
+    def test_valid_pair_cases_cover_field_pairs(self):
+        cases = pairwise_cases()
+        parameters = {field: [value.label for value in field_values(field) if value.valid] for field in FIELDS}
+        rows = [dict(part.split(":", 1) for part in case.id[len("pairXXX("):-1].split(","))
+                for case in cases.values()]
+        assert uncovered_pairs(parameters, rows) == []
+        assert all(case.expected_status == 200 and not case.invalid_fields for case in cases.values())
+
+
+class TestExpectedStatus:
+    """Ожидаемый статус кейса: 200 только если все поля валидны"""
+
+    def test_all_valid(self):
+        case = make_case("valid", {"price": 0, "name": "A"})
+        assert (case.expected_status, case.invalid_fields) == (200, [])
+
+    @pytest.mark.parametrize("field", list(FIELDS))
+    def test_one_invalid_field(self, field):
+        other = "name" if field != "name" else "price"
+        for value in field_values(field):
+            if value.valid:
+                continue
+            case = make_case(value.label, {field: value.value, other: FIELDS[other].default})
+            assert case.expected_status == 400, value.label
+            assert case.invalid_fields == [field]
+
+    def test_several_invalid_fields(self):
+        case = make_case("several", {"price": -1, "statistics.likes": -1, "name": ""})
+        assert case.expected_status == 400
+        assert sorted(case.invalid_fields) == ["name", "price", "statistics.likes"]
+
+    def test_negative_combinations(self):
+        """Сочетания знаковых значений: 400, если невалидно хотя бы одно поле"""
+        fields = ["price", "statistics.likes", "statistics.viewCount", "statistics.contacts"]
+        cases = pairwise_cases(kinds=[SIGN], valid_only=False, fields=fields)
+        assert cases
+        for case in cases.values():
+            assert set(case.values) == set(fields)
+            assert case.expected_status == (400 if case.invalid_fields else 200)
+        assert any(len(case.invalid_fields) > 1 for case in cases.values())
+
+    def test_mixed_validity_pairs(self):
+        """Валидные и невалидные значения вперемешку: 200 только без невалидных полей"""
+        cases = pairwise_cases(kinds=[SIGN, BOUNDARY], valid_only=False, fields=["price", "statistics.likes"])
+        statuses = {}
+        for case in cases.values():
+            statuses.setdefault(len(case.invalid_fields), set()).add(case.expected_status)
+        assert statuses == {0: {200}, 1: {400}, 2: {400}}
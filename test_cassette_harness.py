@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from groups_plugin import V1, V2
+
+
+@pytest.mark.harness
+class TestCassetteHarness:
+    """Кассеты на вложенных прогонах pytest: несколько секунд, поэтому только по -m harness"""
+
+    def test_cassette_replays_subset(self, tmp_path):
+        """Кассета полного прогона воспроизводит отдельные группы тестов без сети"""
+        cassette = tmp_path / "suite.jsonl"
+        # Вложенные прогоны pytest не должны наследовать xdist, кассету и историю этой сессии
+        env = {name: value for name, value in os.environ.items()
+               if not name.startswith(("PYTEST_", "API_CASSETTE", "API_RESULTS"))}
+
+        def run(*args):
+            result = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+                                     f"--cassette={cassette}", *args],
+                                    cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                                    capture_output=True, text=True)
+            assert result.returncode == 0, result.stdout[-2000:]
+
+        run(V1, V2, "--stub", "--cassette-mode=record")
+        run(V1, "-k", "TestApiV1Security")
+        run(V1, "-k", "test_full_ad_lifecycle")
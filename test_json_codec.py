@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from ad_payloads import sample_ad_payload
+from json_codec import CODECS, PayloadTemplate, get_codec
+
+
+@pytest.fixture(params=list(CODECS))
+def codec(request):
+    try:
+        return get_codec(request.param)
+    except ImportError:
+        pytest.skip(f"{request.param} не установлен")
+
+
+class TestPayloadTemplate:
+    """PayloadTemplate.render дает то же тело, что и codec.dumps"""
+
+    @pytest.mark.parametrize("seller_id", [1, 111111, 2 ** 31 - 1, -5, 0])
+    def test_render_matches_dumps(self, codec, seller_id):
+        data = sample_ad_payload(0)
+        rendered = PayloadTemplate(data, "sellerID", codec).render(seller_id)
+        expected = dict(data, sellerID=seller_id)
+        assert rendered == codec.dumps(expected)
+        assert json.loads(rendered) == expected
+
+    def test_non_ascii_name(self, codec):
+        data = sample_ad_payload(0, name="Товар №1 ✓ 日本 \"кавычки\" \\ \t")
+        rendered = PayloadTemplate(data, "sellerID", codec).render(123456)
+        assert codec.loads(rendered) == dict(data, sellerID=123456)
+        assert json.loads(rendered.decode("utf-8")) == dict(data, sellerID=123456)
+
+    @pytest.mark.parametrize("value", ["Товар ✓", "<script>\"x\"</script>", None, [1, "два"], {"вложенный": True}, 2 ** 64])
+    def test_render_any_value(self, codec, value):
+        data = sample_ad_payload(111111)
+        rendered = PayloadTemplate(data, "name", codec).render(value)
+        assert codec.loads(rendered) == dict(data, name=value)
+
+    def test_missing_field_is_added(self, codec):
+        template = PayloadTemplate({"name": "Товар"}, "sellerID", codec)
+        assert codec.loads(template.render(7)) == {"name": "Товар", "sellerID": 7}
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from json_stream import JsonStreamError, iter_json_array
+
+ITEMS = [
+    {"id": "1", "name": "Товар ✓ 日本", "price": -1.5e3, "tags": ["a]", "[b", ",", "}"]},
+    {"name": "escapes \" \\ \n \t \u0001 \\\"]", "nested": {"list": [[], {}, [1, [2]]]}},
+    "строка с , и ] внутри",
+    12345678901234567890,
+    -0.25,
+    True,
+    None,
+    [],
+    {},
+]
+
+
+def split_every(data, size):
+    return [data[offset:offset + size] for offset in range(0, len(data), size)]
+
+
+class TestIterJsonArray:
+    """Разбор массива при любых границах кусков"""
+
+    @pytest.mark.parametrize("ensure_ascii", [False, True])
+    def test_every_split_point(self, ensure_ascii):
+        data = json.dumps(ITEMS, ensure_ascii=ensure_ascii).encode("utf-8")
+        for split in range(len(data) + 1):
+            assert list(iter_json_array([data[:split], data[split:]])) == ITEMS
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7])
+    def test_small_chunks(self, size):
+        data = json.dumps(ITEMS, ensure_ascii=False, indent=2).encode("utf-8")
+        assert list(iter_json_array(split_every(data, size))) == ITEMS
+
+    def test_multibyte_utf8_split(self):
+        data = json.dumps(["ё✓日本😀"], ensure_ascii=False).encode("utf-8")
+        # Каждый байт отдельно: многобайтные символы разрезаны на всех позициях
+        assert list(iter_json_array(bytes([byte]) for byte in data)) == ["ё✓日本😀"]
+
+    def test_numbers_split_at_boundary(self):
+        assert list(iter_json_array([b"[1", b"2, -", b"1.", b"5e", b"3, 7", b"]"])) == [12, -1500.0, 7]
+
+    def test_lazy(self):
+        chunks = iter([b'[{"id": 1},', b' {"id": 2}', b", ", b"broken"])
+        items = iter_json_array(chunks)
+        assert next(items) == {"id": 1}
+        assert next(items) == {"id": 2}
+        with pytest.raises(ValueError):
+            next(items)
+
+    @pytest.mark.parametrize("data", [b"[]", b"  [ ]  ", b"[\n]"])
+    def test_empty_array(self, data):
+        assert list(iter_json_array(split_every(data, 1))) == []
+
+    @pytest.mark.parametrize("data", [
+        b"",
+        b"{}",
+        b'"string"',
+        b"[1,]",
+        b"[,1]",
+        b"[1,,2]",
+        b"[1 2]",
+        b"[1, 2",
+        b'["unterminated',
+        b"[tru]",
+    ])
+    def test_malformed(self, data):
+        with pytest.raises(ValueError):
+            list(iter_json_array(split_every(data, 2)))
+
+    def test_structure_errors_are_stream_errors(self):
+        with pytest.raises(JsonStreamError):
+            list(iter_json_array([b"[1,", b"]"]))
+        with pytest.raises(JsonStreamError):
+            list(iter_json_array([b"[1, 2"]))
@@ -0,0 +1,49 @@
+import time
+
+import pytest
+
+import settings
+from load_runner import LoadRunner, build_client
+from stub_server import AdStore, StubServer
+
+
+class SlowStore(AdStore):
+    """Заглушка, которая отвечает на создание не быстрее delay секунд"""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def create(self, body):
+        time.sleep(self.delay)
+        return super().create(body)
+
+
+@pytest.fixture
+def no_cassette(monkeypatch):
+    # Поведение задается локальной заглушкой, кассета здесь не нужна
+    monkeypatch.setattr(settings, "CASSETTE_PATH", "")
+
+
+class TestLoadRunnerRps:
+    """Открытая модель --rps: расписание, достигнутый RPS и coordinated omission"""
+
+    def run(self, store, rps, concurrency, duration):
+        with StubServer(store=store) as server, build_client(server.url, concurrency, retries=0) as client:
+            return LoadRunner(client, mix={"create": 1}, duration=duration, rps=rps,
+                              concurrency=concurrency, seed=1, cleanup=False).run()
+
+    def test_schedule_kept(self, no_cassette):
+        report = self.run(AdStore(), rps=50, concurrency=4, duration=0.5)
+        assert report.target_rps == 50
+        assert not report.schedule_slipped()
+        assert report.total().count == report.scheduled == 25
+
+    def test_latency_includes_queueing(self, no_cassette):
+        """Сервис отвечает за 50 мс, а слоты идут каждые 10 мс: задержка растет от слота, а не держится 50 мс"""
+        report = self.run(SlowStore(0.05), rps=100, concurrency=1, duration=0.5)
+        summary = report.total().summary(report.duration)
+        assert report.schedule_slipped()
+        assert report.total().count < report.scheduled / 2
+        assert report.max_lag > 0.2
+        assert summary["p90"] > 0.2
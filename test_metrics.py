@@ -0,0 +1,132 @@
+import random
+
+import pytest
+
+import load_runner
+from metrics import EndpointStats, LatencyHistogram
+
+QUANTILES = [0.0, 0.1, 0.5, 0.9, 0.99, 0.999, 1.0]
+
+
+def worker_samples(workers=4, per_worker=5000, seed=1):
+    """Задержки воркеров с разными распределениями: быстрые, медленные, с хвостом"""
+    rng = random.Random(seed)
+    samples = []
+    for index in range(workers):
+        scale = 0.005 * (index + 1)
+        samples.append([rng.lognormvariate(0, 0.5 + index / 4) * scale for _ in range(per_worker)])
+    return samples
+
+
+def exact_quantile(values, q):
+    """Квантиль по тому же рангу, что и LatencyHistogram.quantile"""
+    values = sorted(values)
+    return values[int(q * (len(values) - 1))]
+
+
+class FakeExecutor:
+    """ProcessPoolExecutor, который отдает заранее посчитанные результаты процессов"""
+
+    def __init__(self, results):
+        self.results = results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def map(self, func, tasks):
+        return self.results[:len(list(tasks))]
+
+
+class TestLatencyHistogram:
+    """Точность квантилей и слияние гистограмм"""
+
+    @pytest.mark.parametrize("relative_accuracy", [0.01, 0.05])
+    def test_quantile_within_accuracy(self, relative_accuracy):
+        values = [value for samples in worker_samples() for value in samples]
+        histogram = LatencyHistogram(relative_accuracy)
+        for value in values:
+            histogram.add(value)
+        for q in QUANTILES:
+            exact = exact_quantile(values, q)
+            assert histogram.quantile(q) == pytest.approx(exact, rel=relative_accuracy)
+
+    def test_merged_equals_pooled(self):
+        """Слитые гистограммы воркеров дают те же квантили, что и одна по всем замерам"""
+        samples = worker_samples()
+        pooled = LatencyHistogram()
+        merged = LatencyHistogram()
+        for worker in samples:
+            histogram = LatencyHistogram()
+            for value in worker:
+                histogram.add(value)
+                pooled.add(value)
+            merged.merge(histogram)
+
+        values = [value for worker in samples for value in worker]
+        assert merged.count == len(values)
+        for q in QUANTILES:
+            assert merged.quantile(q) == pooled.quantile(q)
+            assert merged.quantile(q) == pytest.approx(exact_quantile(values, q), rel=merged.relative_accuracy)
+
+    def test_merge_rejects_different_accuracy(self):
+        histogram = LatencyHistogram(0.01)
+        histogram.add(0.1)
+        with pytest.raises(ValueError):
+            histogram.merge(LatencyHistogram(0.02))
+        assert histogram.count == 1
+
+    def test_dict_round_trip(self):
+        histogram = LatencyHistogram()
+        for value in worker_samples(workers=1)[0] + [0.0]:
+            histogram.add(value)
+        restored = LatencyHistogram.from_dict(histogram.to_dict())
+        assert [restored.quantile(q) for q in QUANTILES] == [histogram.quantile(q) for q in QUANTILES]
+        assert (restored.count, restored.zero_count, restored.min, restored.max) == (
+            histogram.count, histogram.zero_count, histogram.min, histogram.max)
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.quantile(0.99) == 0.0
+        assert LatencyHistogram.from_dict(histogram.to_dict()).count == 0
+
+
+class TestRunDistributed:
+    """Отчет run_distributed по гистограммам процессов"""
+
+    def test_percentiles_from_merged_histograms(self, monkeypatch):
+        samples = worker_samples()
+        results = []
+        for index, worker in enumerate(samples):
+            stats = EndpointStats()
+            for value in worker:
+                stats.add(value, 200)
+            results.append({"duration": 10.0 + index, "endpoints": {"GET /api/1/item/{id}": stats.to_dict()},
+                            "retries": {}, "rejected": 0, "leftovers": index, "scheduled": 0,
+                            "max_lag": 0.0})
+        monkeypatch.setattr(load_runner, "ProcessPoolExecutor", lambda processes: FakeExecutor(results))
+
+        report, retry_counts, rejected = load_runner.run_distributed(len(samples), base_url="http://127.0.0.1:1")
+
+        summary = report.to_dict()["endpoints"]["GET /api/1/item/{id}"]
+        values = [value for worker in samples for value in worker]
+        assert summary["requests"] == len(values)
+        for name, q in [("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999)]:
+            assert summary[name] == pytest.approx(exact_quantile(values, q), rel=0.01)
+        # Среднее перцентилей процессов заметно отличалось бы от перцентиля по всем замерам
+        averaged = sum(exact_quantile(worker, 0.99) for worker in samples) / len(samples)
+        assert summary["p99"] != pytest.approx(averaged, rel=0.05)
+        assert report.duration == 13.0
+        assert report.leftovers == 6
+        assert (dict(retry_counts), rejected) == ({}, 0)
+
+    def test_rejects_mixed_accuracy(self):
+        stats = EndpointStats()
+        stats.add(0.1)
+        other = EndpointStats()
+        other.histogram = LatencyHistogram(0.05)
+        other.add(0.1)
+        with pytest.raises(ValueError):
+            stats.merge(EndpointStats.from_dict(other.to_dict()))
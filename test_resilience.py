@@ -0,0 +1,219 @@
+from collections import Counter
+
+import pytest
+import requests
+
+import settings
+from ad_payloads import sample_ad_payload
+from api_client import CLIENT_METHODS, ApiClient, endpoint_name, extract_ad_id
+from resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from stub_server import AdStore, StubServer, error
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FlakyStore(AdStore):
+    """Заглушка, которая первые fail[действие] вызовов отвечает 503"""
+
+    def __init__(self, **fail):
+        super().__init__()
+        self.fail = Counter(fail)
+        self.calls = Counter()
+
+    def _flaky(self, action, *args):
+        with self.lock:
+            self.calls[action] += 1
+            failing = self.fail[action] > 0
+            if failing:
+                self.fail[action] -= 1
+        if failing:
+            return error(503, "temporarily unavailable")
+        return getattr(super(), action)(*args)
+
+    def create(self, body):
+        return self._flaky("create", body)
+
+    def get(self, ad_id):
+        return self._flaky("get", ad_id)
+
+
+class FirstDeleteFails(AdStore):
+    """Первое удаление каждого объявления отвечает 503"""
+
+    def __init__(self):
+        super().__init__()
+        self.seen = set()
+
+    def delete(self, ad_id):
+        with self.lock:
+            first = ad_id not in self.seen
+            self.seen.add(ad_id)
+        return error(503, "temporarily unavailable") if first else super().delete(ad_id)
+
+
+@pytest.fixture
+def no_cassette(monkeypatch):
+    # Поведение задается локальной заглушкой, кассета здесь не нужна
+    monkeypatch.setattr(settings, "CASSETTE_PATH", "")
+
+
+def create_ads(store, count):
+    return [extract_ad_id(store.create(sample_ad_payload(settings.SMOKE_SELLER_ID))[1]) for _ in range(count)]
+
+
+class TestCircuitBreaker:
+    """Переходы closed -> open -> half-open на фиктивных часах"""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=FakeClock())
+        for _ in range(2):
+            breaker.before_request()
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.before_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        assert breaker.rejected == 1
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=FakeClock())
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_single_trial(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+
+        clock.advance(9.9)
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        clock.advance(0.1)
+        breaker.before_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        # Пока пробный запрос в полете, остальные отклоняются
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.before_request()
+
+    def test_failed_trial_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.advance(10)
+        breaker.before_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.opened_at == clock()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        clock.advance(10)
+        breaker.before_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    def test_trial_error_does_not_stick(self, no_cassette, monkeypatch):
+        """Необрабатываемая ошибка пробного запроса — тоже сбой, а не вечный half-open"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        store = FlakyStore(get=1)
+        ad_id, = create_ads(store, 1)
+
+        with StubServer(store=store) as server, ApiClient(
+                base_url=server.url, retry_policy=RetryPolicy(total=0), circuit_breaker=breaker) as client:
+            assert client.get_ad_by_id(ad_id, use_cache=False).status_code == 503
+            assert breaker.state == CircuitBreaker.OPEN
+
+            clock.advance(10)
+            send = client._send
+
+            def broken_send(*args, **kwargs):
+                raise requests.exceptions.InvalidJSONError("broken body")
+
+            monkeypatch.setattr(client, "_send", broken_send)
+            with pytest.raises(requests.exceptions.InvalidJSONError):
+                client.get_ad_by_id(ad_id, use_cache=False)
+            assert breaker.state == CircuitBreaker.OPEN
+
+            monkeypatch.setattr(client, "_send", send)
+            clock.advance(10)
+            assert client.get_ad_by_id(ad_id, use_cache=False).status_code == 200
+            assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestRetryPolicy:
+    """Задержки и повторы RetryPolicy"""
+
+    def test_backoff_grows_to_limit(self):
+        policy = RetryPolicy(backoff_factor=0.1, max_backoff=1.0, jitter=False)
+        assert [policy.backoff(attempt) for attempt in range(6)] == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+
+    def test_jitter_within_limit(self):
+        policy = RetryPolicy(backoff_factor=0.1, max_backoff=1.0)
+        for attempt in range(8):
+            delays = [policy.backoff(attempt) for _ in range(50)]
+            assert all(0 <= delay <= min(1.0, 0.1 * 2 ** attempt) for delay in delays)
+
+    def test_post_not_retried(self):
+        policy = RetryPolicy(total=3)
+        assert policy.retries_for("POST") == 0
+        assert policy.retries_for("GET") == 3
+        assert policy.retries_for("DELETE") == 3
+
+    def test_get_retried_on_5xx(self, no_cassette):
+        store = FlakyStore(get=2)
+        ad_id, = create_ads(store, 1)
+        with StubServer(store=store) as server, ApiClient(
+                base_url=server.url, retry_policy=RetryPolicy(total=3, backoff_factor=0),
+                circuit_breaker=False) as client:
+            assert client.get_ad_by_id(ad_id, use_cache=False).status_code == 200
+            assert client.retry_counts == {endpoint_name(*CLIENT_METHODS["get_ad_by_id"]): 2}
+        assert store.calls["get"] == 3
+
+    def test_retries_exhausted(self, no_cassette):
+        store = FlakyStore(get=10)
+        ad_id, = create_ads(store, 1)
+        with StubServer(store=store) as server, ApiClient(
+                base_url=server.url, retry_policy=RetryPolicy(total=2, backoff_factor=0),
+                circuit_breaker=False) as client:
+            assert client.get_ad_by_id(ad_id, use_cache=False).status_code == 503
+        assert store.calls["get"] == 3
+
+    def test_post_sent_once(self, no_cassette):
+        """POST мог создать объявление до сбоя, поэтому не повторяется"""
+        store = FlakyStore(create=1)
+        with StubServer(store=store) as server, ApiClient(
+                base_url=server.url, retry_policy=RetryPolicy(total=3, backoff_factor=0),
+                circuit_breaker=False) as client:
+            assert client.create_ad(sample_ad_payload(settings.SMOKE_SELLER_ID)).status_code == 503
+            assert not client.retry_counts
+        assert store.calls["create"] == 1
+
+    def test_retry_counts_from_threads(self, no_cassette):
+        """Повторы из потоков пула delete_ads учитываются без потерь"""
+        store = FirstDeleteFails()
+        ad_ids = create_ads(store, 40)
+        with StubServer(store=store) as server, ApiClient(
+                base_url=server.url, retry_policy=RetryPolicy(total=3, backoff_factor=0),
+                circuit_breaker=False) as client:
+            result = client.delete_ads(ad_ids, workers=8)
+            assert len(result.succeeded) == 40
+            assert client.retry_counts == {endpoint_name(*CLIENT_METHODS["delete_ad"]): 40}
@@ -0,0 +1,85 @@
+from response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache:
+    """TTL, вытеснение LRU и сброс записей ResponseCache"""
+
+    def test_hit_and_miss(self):
+        cache = ResponseCache(max_entries=4, ttl=10, clock=FakeClock())
+        assert cache.get("a") is None
+        cache.put("a", "response a")
+        assert cache.get("a") == "response a"
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = ResponseCache(max_entries=4, ttl=10, clock=clock)
+        cache.put("a", "response a")
+
+        clock.now = 9.99
+        assert cache.get("a") == "response a"
+        clock.now = 10
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+        assert "a" not in cache.entries
+
+    def test_put_renews_ttl(self):
+        clock = FakeClock()
+        cache = ResponseCache(max_entries=4, ttl=10, clock=clock)
+        cache.put("a", "old")
+        clock.now = 8
+        cache.put("a", "new")
+        clock.now = 15
+        assert cache.get("a") == "new"
+
+    def test_max_entries_limit(self):
+        cache = ResponseCache(max_entries=3, ttl=10, clock=FakeClock())
+        for index in range(10):
+            cache.put(index, f"response {index}")
+            assert len(cache.entries) <= 3
+        assert list(cache.entries) == [7, 8, 9]
+        assert cache.evictions == 7
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=3, ttl=10, clock=FakeClock())
+        for key in "abc":
+            cache.put(key, key)
+        # Чтение делает "a" самой свежей: вытесняется "b"
+        assert cache.get("a") == "a"
+        cache.put("d", "d")
+        assert cache.get("b") is None
+        assert [cache.get(key) for key in "acd"] == ["a", "c", "d"]
+
+    def test_disabled_when_max_entries_zero(self):
+        cache = ResponseCache(max_entries=0, ttl=10, clock=FakeClock())
+        cache.put("a", "response a")
+        assert cache.get("a") is None
+        assert not cache.entries
+
+    def test_invalidate_ad_and_its_seller_listing(self):
+        cache = ResponseCache(max_entries=10, ttl=10, clock=FakeClock())
+        cache.put("ad 1", "ad", ad_id="1", seller_id=111111)
+        cache.put("listing 111111", "listing", seller_id=111111)
+        cache.put("listing 222222", "listing", seller_id=222222)
+
+        cache.invalidate(ad_id="1")
+        assert list(cache.entries) == ["listing 222222"]
+        assert cache.invalidations == 2
+
+    def test_invalidate_unknown_seller_drops_all_listings(self):
+        cache = ResponseCache(max_entries=10, ttl=10, clock=FakeClock())
+        cache.put("ad 2", "ad", ad_id="2")
+        cache.put("listing 111111", "listing", seller_id=111111)
+        cache.put("listing 222222", "listing", seller_id=222222)
+
+        cache.invalidate(ad_id="1")
+        assert list(cache.entries) == ["ad 2"]
@@ -0,0 +1,146 @@
+"""
+Pytest-плагин: задержки всех запросов ApiClient/AsyncApiClient за сессию.
+
+    pytest --timing                       гистограмма по эндпоинтам и самые медленные вызовы
+    pytest --timing-json timings.json     то же в JSON для отслеживания трендов
+
+Запрос приписывается тесту, только если он отправлен из тела теста; трафик
+фикстур (засев данных, очистка) учитывается отдельно, без теста.
+Работает и под pytest-xdist: воркеры передают записи контроллеру через workeroutput.
+"""
+
+import json
+
+import pytest
+
+from api_client import add_request_listener, endpoint_name, remove_request_listener
+from metrics import EndpointStats, format_ms
+
+# Границы бакетов гистограммы в отчете, мс
+HISTOGRAM_EDGES_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+BAR_WIDTH = 40
+
+# Запросы setup/teardown фикстур не приписываются тесту: в записи test_id = None
+FIXTURE_LABEL = "(фикстуры)"
+
+# Порядок полей записи при передаче между процессами
+RECORD_FIELDS = ("test_id", "method", "route", "status_code", "request_bytes", "response_bytes", "elapsed", "attempt")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("timing", "задержки запросов к API")
+    group.addoption("--timing", action="store_true", help="Показать гистограмму задержек и самые медленные вызовы")
+    group.addoption("--timing-json", metavar="PATH", help="Сохранить записи о запросах и сводку в JSON")
+    group.addoption("--timing-slowest", type=int, default=10, metavar="N", help="Сколько медленных вызовов показать")
+
+
+def pytest_configure(config):
+    if config.getoption("timing") or config.getoption("timing_json"):
+        config.pluginmanager.register(TimingCollector(config), "timing_collector")
+
+
+class TimingCollector:
+    def __init__(self, config):
+        self.config = config
+        self.records = []
+        self.current_test = None
+        add_request_listener(self.on_request)
+
+    def on_request(self, record):
+        self.records.append((
+            self.current_test, record.method, record.route, record.status_code,
+            record.request_bytes, record.response_bytes, record.elapsed, record.attempt,
+        ))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        # Только тело теста: запросы фикстур (засев seeded_ads, очистка) остаются без теста
+        self.current_test = item.nodeid
+        yield
+        self.current_test = None
+
+    def pytest_sessionfinish(self, session):
+        remove_request_listener(self.on_request)
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["timing_records"] = [list(record) for record in self.records]
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        records = getattr(node, "workeroutput", {}).get("timing_records", [])
+        self.records.extend(tuple(record) for record in records)
+
+    def endpoint_stats(self):
+        stats = {}
+        for _, method, route, status_code, _, _, elapsed, _ in self.records:
+            error = status_code is None or status_code >= 500
+            stats.setdefault(endpoint_name(method, route), EndpointStats()).add(elapsed, status_code, error)
+        return stats
+
+    def slowest(self, count):
+        return sorted(self.records, key=lambda record: record[6], reverse=True)[:count]
+
+    def retry_counts(self):
+        """Эндпоинт -> число повторных попыток (записи с attempt > 0)"""
+        counts = {}
+        for _, method, route, _, _, _, _, attempt in self.records:
+            if attempt:
+                name = endpoint_name(method, route)
+                counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if hasattr(self.config, "workeroutput"):
+            return
+        if self.config.getoption("timing_json"):
+            self.write_json(self.config.getoption("timing_json"))
+        if not self.config.getoption("timing") or not self.records:
+            return
+
+        tr = terminalreporter
+        fixture_calls = sum(1 for record in self.records if record[0] is None)
+        tr.write_sep("=", f"задержки запросов к API ({len(self.records)} вызовов, из них фикстур: {fixture_calls})")
+        retry_counts = self.retry_counts()
+        for name, stats in sorted(self.endpoint_stats().items()):
+            summary = stats.summary()
+            retries = f" повторов={retry_counts[name]}" if name in retry_counts else ""
+            tr.write_line(
+                f"{name}: n={summary['requests']} mean={format_ms(summary['mean'])} "
+                f"p50={format_ms(summary['p50'])} p90={format_ms(summary['p90'])} "
+                f"p99={format_ms(summary['p99'])} max={format_ms(summary['max'])} мс{retries}"
+            )
+            for label, count in self.histogram(name):
+                bar = "#" * max(1, round(count / summary["requests"] * BAR_WIDTH)) if count else ""
+                tr.write_line(f"  {label:>12} | {bar} {count if count else ''}")
+
+        tr.write_sep("-", f"{self.config.getoption('timing_slowest')} самых медленных вызовов")
+        for test_id, method, route, status_code, _, response_bytes, elapsed, _ in self.slowest(
+                self.config.getoption("timing_slowest")):
+            tr.write_line(
+                f"{format_ms(elapsed):>9} мс  {endpoint_name(method, route):<30} "
+                f"{status_code if status_code is not None else 'ERR':>4} {response_bytes:>8} B  {test_id or FIXTURE_LABEL}"
+            )
+
+    def histogram(self, name):
+        counts = [0] * (len(HISTOGRAM_EDGES_MS) + 1)
+        for _, method, route, _, _, _, elapsed, _ in self.records:
+            if endpoint_name(method, route) != name:
+                continue
+            elapsed_ms = elapsed * 1000
+            index = next((i for i, edge in enumerate(HISTOGRAM_EDGES_MS) if elapsed_ms < edge), len(HISTOGRAM_EDGES_MS))
+            counts[index] += 1
+        labels = [f"< {edge} мс" for edge in HISTOGRAM_EDGES_MS] + [f">= {HISTOGRAM_EDGES_MS[-1]} мс"]
+        # Пустые бакеты по краям не показываем
+        used = [index for index, count in enumerate(counts) if count]
+        if not used:
+            return []
+        return list(zip(labels, counts))[used[0]:used[-1] + 1]
+
+    def write_json(self, path):
+        data = {
+            "endpoints": {name: stats.summary() for name, stats in sorted(self.endpoint_stats().items())},
+            "retries": self.retry_counts(),
+            "records": [dict(zip(RECORD_FIELDS, record)) for record in self.records],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)